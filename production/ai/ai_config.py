@@ -140,8 +140,8 @@ class EvolutionConfig:
     early_stopping_patience: int = 3
     
     # Training data paths
-    training_data_path: str = "training/training_dataset.csv"
-    test_pool_path: str = "training/test_pool.csv"
+    training_data_path: str = "training/training_dataset.parquet"
+    test_pool_path: str = "training/test_pool.parquet"
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert config to dictionary for serialization"""
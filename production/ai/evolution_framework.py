@@ -15,7 +15,7 @@ from pathlib import Path
 from concurrent.futures import ProcessPoolExecutor, as_completed
 import multiprocessing as mp
 
-from seed_ai import SeedAI
+from seed_ai import SeedAI, load_dataset
 from ai_config import AIConfig, EvolutionConfig
 
 logger = logging.getLogger(__name__)
@@ -24,11 +24,15 @@ logger = logging.getLogger(__name__)
 class EvolutionFramework:
     """Competitive evolution framework for AI optimization"""
     
-    def __init__(self, evolution_config: EvolutionConfig, training_data_path: str = "training/training_dataset.csv"):
+    def __init__(self, evolution_config: EvolutionConfig, training_data_path: str = "training/training_dataset.parquet",
+                 training_data: Optional[pd.DataFrame] = None, test_pool: Optional[pd.DataFrame] = None):
         self.config = evolution_config
         self.training_data_path = training_data_path
         self.test_pool_path = evolution_config.test_pool_path
         
+        # Datasets preloaded by the caller are used instead of re-reading the files
+        self.training_data = training_data
+        
         # Population management
         self.population: List[SeedAI] = []
         self.generation = 0
@@ -38,7 +42,7 @@ class EvolutionFramework:
         self.generation_times: List[float] = []
         
         # Test data
-        self.test_pool: Optional[pd.DataFrame] = None
+        self.test_pool: Optional[pd.DataFrame] = test_pool
         self.current_test_samples: Optional[pd.DataFrame] = None
         
         # Performance tracking
@@ -47,8 +51,12 @@ class EvolutionFramework:
         
     def load_test_pool(self) -> bool:
         """Load the test pool for evaluation"""
+        if self.test_pool is not None:
+            logger.info(f"Using preloaded test pool: {len(self.test_pool)} samples")
+            return True
+        
         try:
-            self.test_pool = pd.read_csv(self.test_pool_path)
+            self.test_pool = load_dataset(self.test_pool_path)
             logger.info(f"Loaded test pool: {len(self.test_pool)} samples")
             return True
         except Exception as e:
@@ -92,8 +100,10 @@ class EvolutionFramework:
     def train_ai_parallel(self, ai: SeedAI) -> Tuple[SeedAI, bool]:
         """Train a single AI with timeout"""
         try:
-            # Load training data
-            if not ai.load_training_data(self.training_data_path):
+            # Load training data (once per AI from disk unless preloaded)
+            if self.training_data is not None:
+                ai.set_training_data(self.training_data)
+            elif not ai.load_training_data(self.training_data_path):
                 return ai, False
             
             # Train with timeout
@@ -47,10 +47,10 @@ def main():
                        help='Crossover rate (default: 0.8)')
     
     # Data paths
-    parser.add_argument('--training-data', type=str, default='training/training_dataset.csv',
-                       help='Path to training data (default: training/training_dataset.csv)')
-    parser.add_argument('--test-pool', type=str, default='training/test_pool.csv',
-                       help='Path to test pool (default: training/test_pool.csv)')
+    parser.add_argument('--training-data', type=str, default='training/training_dataset.parquet',
+                       help='Path to training data (default: training/training_dataset.parquet)')
+    parser.add_argument('--test-pool', type=str, default='training/test_pool.parquet',
+                       help='Path to test pool (default: training/test_pool.parquet)')
     
     # Output
     parser.add_argument('--output-dir', type=str, default='.',
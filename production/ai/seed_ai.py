@@ -20,6 +20,13 @@ from ai_config import AIConfig
 logger = logging.getLogger(__name__)
 
 
+def load_dataset(path: str) -> pd.DataFrame:
+    """Load a Stage 6 dataset from Parquet or CSV based on the file extension"""
+    if Path(path).suffix == '.parquet':
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
 class SeedAI:
     """Base AI model for wildfire prediction using XGBoost"""
     
@@ -36,24 +43,28 @@ class SeedAI:
         self.prediction_times = []
         
     def load_training_data(self, training_data_path: str) -> bool:
-        """Load training data from CSV file"""
+        """Load training data from Parquet or CSV file"""
         try:
-            self.training_data = pd.read_csv(training_data_path)
-            logger.info(f"Loaded training data: {len(self.training_data)} samples")
-            
-            # Separate features and target
-            self.feature_columns = [col for col in self.training_data.columns 
-                                  if col not in ['cell_id', 'target_date', 'fire_occurred']]
-            
-            logger.info(f"Feature columns: {len(self.feature_columns)}")
-            logger.info(f"Features: {self.feature_columns[:10]}...")  # Show first 10
-            
-            return True
+            return self.set_training_data(load_dataset(training_data_path))
             
         except Exception as e:
             logger.error(f"Failed to load training data: {e}")
             return False
     
+    def set_training_data(self, training_data: pd.DataFrame) -> bool:
+        """Use an already loaded training dataset"""
+        self.training_data = training_data
+        logger.info(f"Loaded training data: {len(self.training_data)} samples")
+        
+        # Separate features and target
+        self.feature_columns = [col for col in self.training_data.columns 
+                              if col not in ['cell_id', 'target_date', 'fire_occurred']]
+        
+        logger.info(f"Feature columns: {len(self.feature_columns)}")
+        logger.info(f"Features: {self.feature_columns[:10]}...")  # Show first 10
+        
+        return True
+    
     def train(self) -> bool:
         """Train the XGBoost model"""
         if self.training_data is None:
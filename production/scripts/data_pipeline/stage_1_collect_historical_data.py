@@ -27,9 +27,12 @@ import logging
 import requests
 import tempfile
 from pathlib import Path
+from collections import Counter
 from datetime import datetime, timedelta
 import subprocess
 import psutil
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -42,6 +45,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Read buffer for scanning .dly files (1 MB)
+DLY_READ_BUFFER = 1 << 20
+
+# GHCN-Daily record: 269 fixed-width characters plus newline
+DLY_RECORD_LENGTH = 270
+
+# Read size for draining pigz output past the tar end-of-archive marker (1 MB)
+PIGZ_DRAIN_CHUNK = 1 << 20
+
 class AdaptiveSystemMonitor:
     """Adaptive system monitoring for different hardware configurations"""
     
@@ -275,21 +287,58 @@ class HistoricalDataCollector:
             logger.error(f"❌ Tar file not found: {tar_path}")
             return False
         
+        # The 'data' filter rejects unsafe members and skips owner/permission restoring (Python 3.12+ and backports)
+        extract_kwargs = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+        
         try:
-            with tarfile.open(tar_path, 'r:gz') as tar:
-                tar.extractall(self.historical_noaa_dir)
+            # Count members while extracting instead of walking the extracted tree afterwards
+            extracted_members = 0
+            dly_files = 0
+            extracted_bytes = 0
             
-            # Check what was extracted
-            extracted_files = list(self.historical_noaa_dir.glob('*'))
-            logger.info(f"✅ Extracted {len(extracted_files)} files/directories")
+            # Decompress with multi-threaded pigz when installed, streaming the tar from its stdout
+            pigz_path = shutil.which('pigz')
+            if pigz_path:
+                logger.info("   Decompressing with pigz")
+                pigz = subprocess.Popen([pigz_path, '-dc', str(tar_path)], stdout=subprocess.PIPE)
+            else:
+                pigz = None
             
-            # List the extracted contents
-            for item in extracted_files:
-                if item.is_file():
-                    size_mb = item.stat().st_size / (1024 * 1024)
-                    logger.info(f"   📄 {item.name} ({size_mb:.1f} MB)")
+            try:
+                if pigz:
+                    tar = tarfile.open(fileobj=pigz.stdout, mode='r|')
                 else:
-                    logger.info(f"   📁 {item.name}/")
+                    tar = tarfile.open(tar_path, 'r:gz')
+                
+                with tar:
+                    for member in tar:
+                        tar.extract(member, self.historical_noaa_dir, **extract_kwargs)
+                        extracted_members += 1
+                        if member.isfile():
+                            extracted_bytes += member.size
+                            if member.name.endswith('.dly'):
+                                dly_files += 1
+                
+                # The stream reader stops at the end-of-archive marker - drain the trailing
+                # block padding so pigz can finish writing instead of dying with SIGPIPE
+                if pigz:
+                    while pigz.stdout.read(PIGZ_DRAIN_CHUNK):
+                        pass
+            except BaseException:
+                # Don't leave pigz running against a pipe nobody reads
+                if pigz:
+                    pigz.kill()
+                raise
+            finally:
+                if pigz:
+                    pigz.stdout.close()
+                    pigz.wait()
+            
+            if pigz and pigz.returncode != 0:
+                raise RuntimeError(f"pigz exited with status {pigz.returncode}")
+            
+            logger.info(f"✅ Extracted {extracted_members} files/directories ({extracted_bytes / (1024 * 1024):.1f} MB)")
+            logger.info(f"   📄 {dly_files} .dly station files")
             
             return True
             
@@ -377,11 +426,8 @@ class HistoricalDataCollector:
         # Create canadian_stations directory
         self.canadian_stations_dir.mkdir(parents=True, exist_ok=True)
         
-        # Process each .dly file
-        canadian_files = 0
-        total_records = 0
-        kept_records = 0
-        
+        # Select stations within spatial bounds (metadata only, no file reads)
+        candidates = []
         for dly_file in dly_files:
             station_id = dly_file.stem
             
@@ -401,44 +447,81 @@ class HistoricalDataCollector:
             # Check if within spatial bounds
             if (self.spatial_bounds['min_lat'] <= lat <= self.spatial_bounds['max_lat'] and
                 self.spatial_bounds['min_lon'] <= lon <= self.spatial_bounds['max_lon']):
-                
-                # Filter for temporal bounds and create filtered file
-                filtered_records = self._filter_temporal_bounds(dly_file)
-                if filtered_records > 0:
-                    output_file = self.canadian_stations_dir / dly_file.name
-                    if self._create_filtered_dly_file(dly_file, output_file):
-                        canadian_files += 1
-                        kept_records += filtered_records
-                        logger.info(f"   ✅ {station_id}: {lat:.2f}°N, {lon:.2f}°W ({filtered_records} records)")
-                    else:
-                        logger.warning(f"   ⚠️ {station_id}: Failed to create filtered file")
-                else:
-                    logger.info(f"   ⚠️ {station_id}: No data in temporal bounds")
+                candidates.append((dly_file, lat, lon))
             else:
                 logger.debug(f"   ❌ {station_id}: Outside spatial bounds ({lat:.2f}°N, {lon:.2f}°W)")
         
+        # Filter each station file for temporal bounds - files are independent, so scan them in parallel
+        candidate_files = [dly_file for dly_file, _, _ in candidates]
+        max_processes = self.system_monitor.get_optimal_processes()
+        logger.info(f"   Filtering {len(candidate_files)} stations with {max_processes} processes")
+        
+        if max_processes > 1 and len(candidate_files) > 1:
+            # The collector (bounds and directories) is sent once per worker; tasks are just file paths
+            with ProcessPoolExecutor(max_workers=max_processes, initializer=init_filter_worker, initargs=(self,)) as executor:
+                results = list(executor.map(filter_station_file_parallel, candidate_files, chunksize=32))
+        else:
+            results = [self._filter_station_file(dly_file) for dly_file in candidate_files]
+        
+        canadian_files = 0
+        kept_records = 0
+        
+        for (dly_file, lat, lon), (filtered_records, created) in zip(candidates, results):
+            station_id = dly_file.stem
+            if filtered_records > 0:
+                if created:
+                    canadian_files += 1
+                    kept_records += filtered_records
+                    logger.info(f"   ✅ {station_id}: {lat:.2f}°N, {lon:.2f}°W ({filtered_records} records)")
+                else:
+                    logger.warning(f"   ⚠️ {station_id}: Failed to create filtered file")
+            else:
+                logger.info(f"   ⚠️ {station_id}: No data in temporal bounds")
+        
         logger.info(f"✅ Canadian station filtering complete")
         logger.info(f"   Files processed: {canadian_files}")
         logger.info(f"   Records kept: {kept_records:,}")
         
         return canadian_files > 0
     
+    def _filter_station_file(self, dly_file):
+        """Filter one station file into canadian_stations and return (records, created)"""
+        filtered_records = self._filter_temporal_bounds(dly_file)
+        if filtered_records == 0:
+            return filtered_records, False
+        
+        return filtered_records, self._create_filtered_dly_file(dly_file, self.canadian_stations_dir / dly_file.name)
+    
+    def _in_bounds_record_mask(self, data):
+        """Return the per-record temporal-bounds mask for a well-formed .dly byte grid (None if irregular)"""
+        if len(data) % DLY_RECORD_LENGTH != 0 or not np.all(data[DLY_RECORD_LENGTH - 1::DLY_RECORD_LENGTH] == ord('\n')):
+            return None
+        
+        digits = data.reshape(-1, DLY_RECORD_LENGTH)[:, 11:15].astype(np.int32) - ord('0')
+        valid = ((digits >= 0) & (digits <= 9)).all(axis=1)
+        years = digits @ np.array([1000, 100, 10, 1])
+        return valid & (years >= self.temporal_bounds['start_year']) & (years <= self.temporal_bounds['end_year'])
+    
     def _filter_temporal_bounds(self, dly_file):
         """Filter a .dly file for temporal bounds and return record count"""
         try:
-            with open(dly_file, 'r') as f:
-                lines = f.readlines()
+            # Well-formed files are a grid of fixed-width records - read every year field in one numpy pass
+            in_bounds = self._in_bounds_record_mask(np.fromfile(dly_file, dtype=np.uint8))
+            if in_bounds is not None:
+                return int(np.count_nonzero(in_bounds))
             
+            # Otherwise scan line by line - .dly records are ASCII, so slice raw bytes without decoding
             kept_records = 0
-            for line in lines:
-                if len(line) >= 15:
-                    year_str = line[11:15]
-                    try:
-                        year = int(year_str)
-                        if self.temporal_bounds['start_year'] <= year <= self.temporal_bounds['end_year']:
-                            kept_records += 1
-                    except ValueError:
-                        continue
+            with open(dly_file, 'rb', buffering=DLY_READ_BUFFER) as f:
+                for line in f:
+                    if len(line) >= 15:
+                        year_str = line[11:15]
+                        try:
+                            year = int(year_str)
+                            if self.temporal_bounds['start_year'] <= year <= self.temporal_bounds['end_year']:
+                                kept_records += 1
+                        except ValueError:
+                            continue
             
             return kept_records
             
@@ -449,17 +532,30 @@ class HistoricalDataCollector:
     def _create_filtered_dly_file(self, source_file, output_file):
         """Create a filtered .dly file with only data within temporal bounds"""
         try:
-            with open(source_file, 'r') as f_in, open(output_file, 'w') as f_out:
+            # Well-formed files: select in-bounds records with one numpy mask instead of a Python loop per line
+            data = np.fromfile(source_file, dtype=np.uint8)
+            in_bounds = self._in_bounds_record_mask(data)
+            if in_bounds is not None:
+                with open(output_file, 'wb') as f_out:
+                    f_out.write(data.reshape(-1, DLY_RECORD_LENGTH)[in_bounds].tobytes())
+                return True
+            
+            # Otherwise filter line by line, collecting kept lines for a single write
+            kept_lines = []
+            with open(source_file, 'rb', buffering=DLY_READ_BUFFER) as f_in:
                 for line in f_in:
                     if len(line) >= 15:
                         year_str = line[11:15]
                         try:
                             year = int(year_str)
                             if self.temporal_bounds['start_year'] <= year <= self.temporal_bounds['end_year']:
-                                f_out.write(line)
+                                kept_lines.append(line)
                         except ValueError:
                             continue
             
+            with open(output_file, 'wb') as f_out:
+                f_out.write(b''.join(kept_lines))
+            
             return True
             
         except Exception as e:
@@ -562,28 +658,27 @@ class HistoricalDataCollector:
         """Verify that all data is within our temporal bounds"""
         logger.info("   📅 Verifying temporal bounds...")
         
-        years_found = set()
-        total_records = 0
+        year_counts = Counter()
         
         # Sample a few files to check years
         sample_files = dly_files[:min(10, len(dly_files))]
         
         for dly_file in sample_files:
             try:
-                with open(dly_file, 'r') as f:
-                    for line in f:
-                        if len(line) >= 15:
-                            year_str = line[11:15]
-                            try:
-                                year = int(year_str)
-                                years_found.add(year)
-                                total_records += 1
-                            except ValueError:
-                                continue
+                # Counter tallies the raw year fields in C; only the distinct values get parsed
+                with open(dly_file, 'rb', buffering=DLY_READ_BUFFER) as f:
+                    file_years = Counter(line[11:15] for line in f if len(line) >= 15)
+                
+                for year_str, count in file_years.items():
+                    try:
+                        year_counts[int(year_str)] += count
+                    except ValueError:
+                        continue
             except Exception as e:
                 logger.warning(f"   ⚠️ Error reading {dly_file.name}: {e}")
         
-        years_found = sorted(years_found)
+        years_found = sorted(year_counts)
+        total_records = sum(year_counts.values())
         logger.info(f"   Years found in sample: {years_found}")
         logger.info(f"   Total records in sample: {total_records}")
         
@@ -656,6 +751,18 @@ class HistoricalDataCollector:
             logger.error(f"   Traceback: {traceback.format_exc()}")
             return False
 
+# Collector used by station filtering worker processes (set once per worker by the pool initializer)
+_worker_collector = None
+
+def init_filter_worker(collector):
+    """Store the collector for this worker process (pool initializer)"""
+    global _worker_collector
+    _worker_collector = collector
+
+def filter_station_file_parallel(dly_file):
+    """Filter one station file for temporal bounds (worker function)"""
+    return _worker_collector._filter_station_file(dly_file)
+
 def main():
     """Main execution function"""
     import sys
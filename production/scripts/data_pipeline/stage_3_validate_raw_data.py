@@ -13,9 +13,13 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime, date
 import shutil
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 import re
+import calendar
+import mmap
+import struct
 import psutil
+from concurrent.futures import ProcessPoolExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +32,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Days per month for a non-leap year (February is adjusted per year)
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Fixed-width .dly header: station_id, year, month, variable
+DLY_HEADER = struct.Struct('11s4s2s4s')
+TARGET_VARIABLES = ('TMAX', 'TMIN', 'PRCP', 'SNWD', 'TAVG')
+
+# Variable column order in weather_records.csv
+WIDE_VARIABLE_ORDER = ('TMAX', 'TMIN', 'TAVG', 'PRCP', 'SNWD')
+
+# Raw header bytes -> shared variable name strings (one str object per variable, no per-line decode)
+TARGET_VARIABLE_CODES = {variable.encode(): variable for variable in TARGET_VARIABLES}
+
+# Unit conversion for raw .dly values (tenths of °C / tenths of mm; SNWD is already in mm)
+VALUE_DIVISORS = {'TMAX': 10.0, 'TMIN': 10.0, 'TAVG': 10.0, 'PRCP': 10.0}
+
 class AdaptiveSystemMonitor:
     """Adaptive system monitoring for different hardware configurations"""
     
@@ -200,6 +220,11 @@ class RawDataValidator:
         self.temp_bounds = {'min': -60, 'max': 45}  # °C
         self.precip_bounds = {'min': 0, 'max': 500}  # mm
         self.snow_bounds = {'min': 0, 'max': 500}   # cm
+        self.value_bounds = {
+            'TMAX': self.temp_bounds, 'TMIN': self.temp_bounds, 'TAVG': self.temp_bounds,
+            'PRCP': self.precip_bounds,
+            'SNWD': self.snow_bounds
+        }
         
     def clear_validated_data_folder(self):
         """Clear the validated_data folder for a fresh start"""
@@ -342,50 +367,55 @@ class RawDataValidator:
             raise Exception(f"Canadian stations directory not found: {self.dly_files_dir}")
         
         weather_data = {}  # station_id -> date -> {variable: (value, quality)}
-        dly_files = list(self.dly_files_dir.glob("*.dly"))
-        
-        logger.info(f"   📁 Processing {len(dly_files)} .dly files...")
-        
-        for file_idx, dly_file in enumerate(dly_files, 1):
-            if file_idx % 100 == 0:
-                logger.info(f"   📈 Progress: {file_idx}/{len(dly_files)} files")
-            
-            try:
-                self._process_dly_file_wide(dly_file, weather_data)
-            except Exception as e:
-                self.stats['errors'].append(f"File {dly_file.name}: {e}")
-                continue
+        # Sorted by station ID so the weather CSV (and stage 4's primary-key inserts) come out in key order
+        dly_files = sorted(self.dly_files_dir.glob("*.dly"))
+        
+        # Station files are independent - parse them in parallel and merge in file order
+        max_processes = self.system_monitor.get_optimal_processes()
+        logger.info(f"   📁 Processing {len(dly_files)} .dly files with {max_processes} processes...")
+        
+        if max_processes > 1 and len(dly_files) > 1:
+            with ProcessPoolExecutor(max_workers=max_processes, initializer=init_dly_worker, initargs=(self,)) as executor:
+                file_results = executor.map(parse_dly_file_parallel, dly_files,
+                                            chunksize=self.system_monitor.get_optimal_files_per_chunk())
+                self._merge_dly_results(file_results, weather_data, len(dly_files))
+        else:
+            self._merge_dly_results(map(self._parse_dly_file, dly_files), weather_data, len(dly_files))
         
         # Convert to wide format DataFrame
         logger.info("   🔄 Converting to wide format DataFrame...")
-        weather_records = []
+        # Build one list per column (no per-record dict), then hand the columns to pandas in one go
+        station_ids = []
+        record_dates = []
+        values = {variable: [] for variable in TARGET_VARIABLES}
+        qualities = {variable: [] for variable in TARGET_VARIABLES}
+        missing = (None, None)
         
         for station_id, dates in weather_data.items():
-            for date, variables in dates.items():
-                record = {
-                    'station_id': station_id,
-                    'date': date,
-                    'tmax': None, 'tmin': None, 'tavg': None, 'prcp': None, 'snwd': None,
-                    'tmax_quality': None, 'tmin_quality': None, 'tavg_quality': None, 
-                    'prcp_quality': None, 'snwd_quality': None
-                }
-                
-                # Fill in available variables
-                for var, (value, quality) in variables.items():
-                    var_lower = var.lower()
-                    record[var_lower] = value
-                    record[f"{var_lower}_quality"] = quality
+            # Days arrive per variable line, so order them to keep rows in (station_id, date) key order
+            for date, variables in sorted(dates.items()):
+                station_ids.append(station_id)
+                record_dates.append(date)
                 
-                weather_records.append(record)
-        
-        # Create DataFrame and save
-        weather_df = pd.DataFrame(weather_records)
+                # Fill in available variables (None where a variable is missing)
+                for variable in TARGET_VARIABLES:
+                    value, quality = variables.get(variable, missing)
+                    values[variable].append(value)
+                    qualities[variable].append(quality)
+        
+        # Create DataFrame (same column order as the wide weather table) and save
+        weather_columns = {'station_id': station_ids, 'date': record_dates}
+        for variable in WIDE_VARIABLE_ORDER:
+            weather_columns[variable.lower()] = values[variable]
+        for variable in WIDE_VARIABLE_ORDER:
+            weather_columns[f"{variable.lower()}_quality"] = qualities[variable]
+        weather_df = pd.DataFrame(weather_columns)
         weather_df.to_csv(self.weather_csv, index=False)
         
-        self.stats['weather_records_processed'] = len(weather_records)
+        self.stats['weather_records_processed'] = len(weather_df)
         self.stats['weather_records_valid'] = len(weather_df)
         
-        logger.info(f"   ✅ Processed {len(weather_records)} weather records (wide format)")
+        logger.info(f"   ✅ Processed {len(weather_df)} weather records (wide format)")
         if len(weather_df) > 0:
             # Count non-null values for each variable
             var_counts = {}
@@ -575,40 +605,97 @@ class RawDataValidator:
         
         return any(geometry_wkt.startswith(prefix) for prefix in valid_prefixes)
     
-    def _process_dly_file_wide(self, dly_file: Path, weather_data: Dict):
+    def _parse_dly_file(self, dly_file: Path) -> Tuple[Dict, List[str]]:
+        """Parse a single .dly file into its own wide-format dict and error list"""
+        
+        weather_data = {}
+        errors = []
+        
+        try:
+            self._process_dly_file_wide(dly_file, weather_data, errors)
+        except Exception as e:
+            errors.append(f"File {dly_file.name}: {e}")
+        
+        return weather_data, errors
+    
+    def _merge_dly_results(self, file_results, weather_data: Dict, total_files: int):
+        """Merge per-file parse results into the shared wide-format dict"""
+        
+        for file_idx, (file_weather_data, file_errors) in enumerate(file_results, 1):
+            if file_idx % 100 == 0:
+                logger.info(f"   📈 Progress: {file_idx}/{total_files} files")
+            
+            self.stats['errors'].extend(file_errors)
+            
+            for station_id, dates in file_weather_data.items():
+                if station_id not in weather_data:
+                    weather_data[station_id] = dates
+                    continue
+                
+                # Same station in several files - later files overwrite matching variables
+                station_dates = weather_data[station_id]
+                for date_str, variables in dates.items():
+                    station_dates.setdefault(date_str, {}).update(variables)
+    
+    def _process_dly_file_wide(self, dly_file: Path, weather_data: Dict, errors: Optional[List[str]] = None):
         """Process a single .dly file and extract valid weather records in wide format"""
         
+        if errors is None:
+            errors = self.stats['errors']
+        
         records_found = 0
+        station_field_seen = None
         
-        with open(dly_file, 'r') as f:
-            for line_num, line in enumerate(f, 1):
-                if len(line) < 35:  # Skip incomplete lines
+        # Empty files cannot be memory-mapped
+        if dly_file.stat().st_size == 0:
+            return
+        
+        with open(dly_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            file_size = len(mm)
+            line_start = 0
+            line_num = 0
+            
+            while line_start < file_size:
+                # Walk the mapped file line by line without copying skipped lines
+                newline = mm.find(b'\n', line_start)
+                line_end = file_size if newline == -1 else newline + 1
+                line_offset = line_start
+                line_start = line_end
+                line_num += 1
+                
+                if line_end - line_offset < 35:  # Skip incomplete lines
                     continue
                 
                 try:
-                    # Parse .dly line format
-                    station_id = line[0:11].strip()
-                    year = int(line[11:15])
-                    month = int(line[15:17])
-                    variable = line[17:21].strip()
+                    # Unpack the fixed-width header in one call (no per-field slicing)
+                    station_field, year_field, month_field, variable_field = DLY_HEADER.unpack_from(mm, line_offset)
+                    # Decode before int() so parse errors quote the text, not a bytes repr
+                    year = int(year_field.decode('ascii'))
+                    month = int(month_field.decode('ascii'))
+                    variable = TARGET_VARIABLE_CODES.get(variable_field)
                     
                     # Only process our target variables
-                    if variable not in ['TMAX', 'TMIN', 'PRCP', 'SNWD', 'TAVG']:
+                    if variable is None:
                         continue
                     
                     # Only process our target years (adjust based on available data)
                     if not (2022 <= year <= 2025):
                         continue
                     
-                    # Extract daily values and quality flags
-                    daily_data = self._extract_daily_values(line, year, month, variable)
+                    # Decode the station ID once per run of lines (a file normally holds one station)
+                    if station_field != station_field_seen:
+                        station_id = station_field.strip().decode()
+                        station_field_seen = station_field
+                        
+                        # Initialize station data structure if needed
+                        if station_id not in weather_data:
+                            weather_data[station_id] = {}
                     
-                    # Initialize station data structure if needed
-                    if station_id not in weather_data:
-                        weather_data[station_id] = {}
+                    # Copy and decode only the lines we keep
+                    line = mm[line_offset:line_end].decode()
                     
-                    # Add valid records
-                    for day, (value, quality) in daily_data.items():
+                    # Add valid records straight from the daily value stream
+                    for day, value, quality in self._extract_daily_values(line, year, month, variable):
                         if value is not None and quality == 'C':  # Only complete data
                             date_str = f"{year}-{month:02d}-{day:02d}"
                             
@@ -621,7 +708,7 @@ class RawDataValidator:
                             records_found += 1
                 
                 except (ValueError, IndexError) as e:
-                    self.stats['errors'].append(f"File {dly_file.name}, line {line_num}: {e}")
+                    errors.append(f"File {dly_file.name}, line {line_num}: {e}")
                     continue
         
         # Debug output for first few files
@@ -653,11 +740,8 @@ class RawDataValidator:
                     if not (2022 <= year <= 2025):
                         continue
                     
-                    # Extract daily values and quality flags
-                    daily_data = self._extract_daily_values(line, year, month, variable)
-                    
-                    # Add valid records
-                    for day, (value, quality) in daily_data.items():
+                    # Add valid records straight from the daily value stream
+                    for day, value, quality in self._extract_daily_values(line, year, month, variable):
                         if value is not None and quality == 'C':  # Only complete data
                             weather_records.append({
                                 'station_id': station_id,
@@ -677,20 +761,13 @@ class RawDataValidator:
         if dly_file.name in ['CA001057052.dly', 'CA001010066.dly', 'CA001017098.dly']:
             logger.info(f"   Debug {dly_file.name}: Found {records_found} records")
     
-    def _extract_daily_values(self, line: str, year: int, month: int, variable: str) -> Dict[int, Tuple[Optional[float], str]]:
-        """Extract daily values and quality flags from a .dly line"""
-        
-        daily_data = {}
-        
-        # Calculate days in month
-        if month in [1, 3, 5, 7, 8, 10, 12]:
-            days_in_month = 31
-        elif month in [4, 6, 9, 11]:
-            days_in_month = 30
-        elif month == 2:
-            days_in_month = 29 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 28
-        else:
-            return daily_data
+    def _extract_daily_values(self, line: str, year: int, month: int, variable: str) -> Iterator[Tuple[int, Optional[float], str]]:
+        """Yield (day, value, quality_flag) tuples from a .dly line"""
+        
+        # Look up days in month
+        if not 1 <= month <= 12:
+            return
+        days_in_month = DAYS_IN_MONTH[month - 1] + (month == 2 and calendar.isleap(year))
         
         # Parse the data section (starts after position 21)
         data_section = line[21:].strip()
@@ -698,6 +775,10 @@ class RawDataValidator:
         # Split by spaces and process in pairs (value, quality_flag)
         parts = data_section.split()
         
+        # Resolve unit conversion and bounds once per line
+        divisor = VALUE_DIVISORS.get(variable, 1.0)
+        bounds = self.value_bounds.get(variable)
+        
         # Process each day's data
         for day in range(1, min(days_in_month + 1, len(parts) // 2 + 1)):
             if day * 2 - 1 < len(parts):
@@ -709,38 +790,26 @@ class RawDataValidator:
                     value = None
                 else:
                     try:
-                        value = float(value_str)
-                        
                         # Convert to proper units
-                        if variable in ['TMAX', 'TMIN', 'TAVG']:
-                            value = value / 10.0  # Convert tenths of °C to °C
-                        elif variable == 'PRCP':
-                            value = value / 10.0  # Convert tenths of mm to mm
-                        elif variable == 'SNWD':
-                            value = value  # Already in mm
+                        value = float(value_str) / divisor
                         
                         # Validate value ranges
-                        if not self._validate_value(value, variable):
+                        if bounds is not None and not bounds['min'] <= value <= bounds['max']:
                             value = None
                     
                     except ValueError:
                         value = None
                 
-                daily_data[day] = (value, quality_flag)
-        
-        return daily_data
+                yield day, value, quality_flag
     
     def _validate_value(self, value: float, variable: str) -> bool:
         """Validate that a weather value is within reasonable bounds"""
         
-        if variable in ['TMAX', 'TMIN', 'TAVG']:
-            return self.temp_bounds['min'] <= value <= self.temp_bounds['max']
-        elif variable == 'PRCP':
-            return self.precip_bounds['min'] <= value <= self.precip_bounds['max']
-        elif variable == 'SNWD':
-            return self.snow_bounds['min'] <= value <= self.snow_bounds['max']
+        bounds = self.value_bounds.get(variable)
+        if bounds is None:
+            return True
         
-        return True
+        return bounds['min'] <= value <= bounds['max']
     
     def generate_validation_report(self):
         """Generate detailed validation report"""
@@ -832,6 +901,18 @@ class RawDataValidator:
             logger.error(f"❌ Validation failed: {e}")
             return False
 
+# Validator used by .dly parsing worker processes (set once per worker by the pool initializer)
+_worker_validator = None
+
+def init_dly_worker(validator):
+    """Store the validator for this worker process (pool initializer)"""
+    global _worker_validator
+    _worker_validator = validator
+
+def parse_dly_file_parallel(dly_file):
+    """Parse one station .dly file (worker function)"""
+    return _worker_validator._parse_dly_file(dly_file)
+
 def main():
     """Main execution function"""
     import argparse
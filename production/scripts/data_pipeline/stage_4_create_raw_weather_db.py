@@ -15,6 +15,7 @@ from datetime import datetime
 from scipy.spatial.distance import cdist
 import sys
 import psutil
+from itertools import islice
 
 # Configure logging
 logging.basicConfig(
@@ -27,6 +28,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rows per executemany call when loading weather data
+WEATHER_INSERT_BATCH_SIZE = 50000
+
+# weather_data_wide columns filled from the validated CSV and computed features
+WEATHER_COLUMNS = [
+    'station_id', 'date', 'tmax', 'tmin', 'tavg', 'prcp', 'snwd',
+    'tmax_quality', 'tmin_quality', 'tavg_quality', 'prcp_quality', 'snwd_quality',
+    'temp_range', 'year', 'month', 'day_of_year', 'season', 'data_completeness'
+]
+
 class AdaptiveSystemMonitor:
     """Adaptive system monitoring for different hardware configurations"""
     
@@ -203,6 +214,9 @@ class OptimizedRawWeatherDatabaseCreator:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
+        # Larger pages for the wide weather rows (only takes effect before the first table is created)
+        cursor.execute("PRAGMA page_size=8192")
+        
         # 1. Stations table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS stations (
@@ -381,25 +395,10 @@ class OptimizedRawWeatherDatabaseCreator:
         logger.info(f"   ✅ Populated stations table with {len(stations_df):,} stations")
         return len(stations_df)
     
-    def populate_weather_data_optimized(self):
-        """Populate weather data table from wide format CSV (NO PIVOT NEEDED!)"""
-        logger.info("🌡️ Populating weather data table (OPTIMIZED - no pivot)...")
-        
-        if not self.weather_csv.exists():
-            raise Exception(f"Weather records CSV not found: {self.weather_csv}")
-        
-        logger.info("   🚀 Reading wide format weather data (NO PIVOT OPERATION!)...")
-        
-        # Use adaptive chunk size based on hardware
-        chunk_size = self.system_monitor.get_optimal_chunk_size()
-        logger.info(f"   🔧 Using adaptive chunk size: {chunk_size:,} records")
-        
-        # Check memory before starting
-        self.system_monitor.log_memory_status()
+    def _iter_weather_rows(self, chunk_size):
+        """Yield enhanced weather rows (in WEATHER_COLUMNS order) from the wide format CSV, chunk by chunk"""
         total_records = 0
         
-        conn = sqlite3.connect(self.db_path)
-        
         for chunk_idx, chunk in enumerate(pd.read_csv(self.weather_csv, chunksize=chunk_size)):
             # Ensure all required columns exist (fill missing with None)
             base_cols = ['station_id', 'date', 'tmax', 'tmin', 'tavg', 'prcp', 'snwd',
@@ -445,16 +444,81 @@ class OptimizedRawWeatherDatabaseCreator:
             # Convert date back to string for database
             chunk['date'] = chunk['date'].dt.strftime('%Y-%m-%d')
             
-            # Insert enhanced chunk into database
-            chunk.to_sql('weather_data_wide', conn, if_exists='append', index=False)
+            # Yield enhanced rows in table column order (NaN -> NULL, numpy scalars -> Python objects)
+            rows = chunk[WEATHER_COLUMNS].astype(object)
+            yield from rows.where(rows.notna(), None).itertuples(index=False, name=None)
             
             total_records += len(chunk)
             
             if (chunk_idx + 1) % 10 == 0:
                 logger.info(f"      📈 Progress: {total_records:,} records processed")
+    
+    def populate_weather_data_optimized(self):
+        """Populate weather data table from wide format CSV (NO PIVOT NEEDED!)"""
+        logger.info("🌡️ Populating weather data table (OPTIMIZED - no pivot)...")
         
-        # Verify import
+        if not self.weather_csv.exists():
+            raise Exception(f"Weather records CSV not found: {self.weather_csv}")
+        
+        logger.info("   🚀 Reading wide format weather data (NO PIVOT OPERATION!)...")
+        
+        # Use adaptive chunk size based on hardware
+        chunk_size = self.system_monitor.get_optimal_chunk_size()
+        logger.info(f"   🔧 Using adaptive chunk size: {chunk_size:,} records")
+        
+        # Check memory before starting
+        self.system_monitor.log_memory_status()
+        
+        # Autocommit mode: the load's transaction is opened and committed explicitly below.
+        # One cursor is reused for every statement in the load.
+        conn = sqlite3.connect(self.db_path, isolation_level=None, cached_statements=512)
         cursor = conn.cursor()
+        
+        # Bulk-load tuning: WAL journal, relaxed fsync, in-memory temp tables, 256MB page cache,
+        # memory-mapped reads (SQLite clamps mmap_size to its compile-time maximum)
+        cursor.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-262144;
+            PRAGMA mmap_size=30000000000;
+        """)
+        
+        # Defer weather index maintenance until the bulk load is done
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = 'weather_data_wide' AND sql IS NOT NULL"
+        )
+        weather_indexes = cursor.fetchall()
+        for index_name, _ in weather_indexes:
+            cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+        logger.info(f"   🔧 Dropped {len(weather_indexes)} weather indexes for bulk load")
+        
+        try:
+            # Load every chunk inside one explicit transaction (to_sql commits per call)
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            # Stream rows from all CSV chunks into executemany in large slices (no row lists are built)
+            insert_sql = (f"INSERT INTO weather_data_wide ({', '.join(WEATHER_COLUMNS)}) "
+                          f"VALUES ({', '.join('?' * len(WEATHER_COLUMNS))})")
+            weather_rows = self._iter_weather_rows(chunk_size)
+            while True:
+                cursor.executemany(insert_sql, islice(weather_rows, WEATHER_INSERT_BATCH_SIZE))
+                if cursor.rowcount < WEATHER_INSERT_BATCH_SIZE:
+                    break
+            
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            # Rebuild indexes in one pass over the loaded table (also restores them on failure)
+            for _, index_sql in weather_indexes:
+                cursor.execute(index_sql)
+            conn.commit()
+            logger.info(f"   📊 Recreated {len(weather_indexes)} weather indexes")
+        
+        # Verify import
         cursor.execute("SELECT COUNT(*) FROM weather_data_wide")
         count = cursor.fetchone()[0]
         
@@ -16,15 +16,33 @@ Key Features:
 import sqlite3
 import pandas as pd
 import numpy as np
+from scipy.spatial import cKDTree
 import logging
 import argparse
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
+import io
 import json
 import math
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List
 import time
 import warnings
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Optional: numba compiles the yearly window kernel; the numpy path is used without it
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional: orjson writes the metadata JSON; stdlib json is used without it
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 warnings.filterwarnings('ignore')
 
@@ -43,6 +61,79 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def to_day_number(date) -> int:
+    """Days since 1970-01-01 for an ISO date string or datetime"""
+    return int(np.datetime64(date, 'D').astype(np.int64))
+
+# Compiled and numpy paths sum in a different order, so they agree to this relative
+# tolerance (observed differences are ~1e-14), not bit for bit
+YEARLY_WINDOW_RTOL = 1e-12
+
+def yearly_window_stats(days, tavg, tmax, prcp, fire_occurred, center_days, half_window):
+    """Avg temp, max temp, total precip, dry days and fire flag for each ±half_window window"""
+    stats = np.zeros((len(center_days), 5))
+    for i in range(len(center_days)):
+        # History is sorted by day, so each window is a contiguous slice
+        lo = np.searchsorted(days, center_days[i] - half_window, side='left')
+        hi = np.searchsorted(days, center_days[i] + half_window, side='right')
+        if hi <= lo:
+            continue
+        
+        temp_sum = 0.0
+        temp_count = 0
+        max_temp = -np.inf
+        max_count = 0
+        for j in range(lo, hi):
+            # NaN-skipping like np.nanmean / np.nanmax / np.nansum
+            if not np.isnan(tavg[j]):
+                temp_sum += tavg[j]
+                temp_count += 1
+            if not np.isnan(tmax[j]):
+                max_temp = max(max_temp, tmax[j])
+                max_count += 1
+            if not np.isnan(prcp[j]):
+                stats[i, 2] += prcp[j]
+            if prcp[j] < 1.0:
+                stats[i, 3] += 1
+            stats[i, 4] = max(stats[i, 4], fire_occurred[j])
+        stats[i, 0] = temp_sum / temp_count if temp_count > 0 else np.nan
+        stats[i, 1] = max_temp if max_count > 0 else np.nan
+    return stats
+
+if NUMBA_AVAILABLE:
+    yearly_window_stats = njit(cache=True)(yearly_window_stats)
+
+# Non-numeric dataset columns (everything else is stored as float)
+TEXT_COLUMNS = ('target_date', 'terrain_type')
+
+# Water cells have no weather data - every feature except the cell identity is constant
+WATER_FEATURE_TEMPLATE = {
+    'year_1_avg_temp': 0.0,
+    'year_1_max_temp': 0.0,
+    'year_1_total_precip': 0.0,
+    'year_1_dry_days': 0.0,
+    'year_1_fire_occurred': 0.0,
+    'year_2_avg_temp': 0.0,
+    'year_2_max_temp': 0.0,
+    'year_2_total_precip': 0.0,
+    'year_2_dry_days': 0.0,
+    'year_2_fire_occurred': 0.0,
+    'year_3_avg_temp': 0.0,
+    'year_3_max_temp': 0.0,
+    'year_3_total_precip': 0.0,
+    'year_3_dry_days': 0.0,
+    'year_3_fire_occurred': 0.0,
+    'neighbor_avg_temp': 0.0,
+    'neighbor_max_temp': 0.0,
+    'neighbor_total_precip': 0.0,
+    'neighbor_fire_frequency': 0.0,
+    'historical_fire_frequency': 0.0,
+    'area_km2': 100.0,  # Standard cell area
+    'elevation_m': 0.0,  # Water level
+    'distance_to_urban_km': 50.0,  # Assume far from urban
+    'fire_occurred': 0.0  # Water cells never have fires
+}
+
 class TrainingDataGenerator:
     """Generates training and testing datasets for AI wildfire prediction"""
     
@@ -55,6 +146,7 @@ class TrainingDataGenerator:
         self.training_targets = 500
         self.test_pool_size = 5000
         self.test_per_generation = 200
+        self.export_csv = False  # Parquet is the primary output format
         
         # Geographic stratification
         self.terrain_stratification = {
@@ -63,6 +155,7 @@ class TrainingDataGenerator:
             'urban': 0.20,     # 20% - urban areas
             'water': 0.15      # 15% - water cells (always no-fire, teaches AI water = no fire)
         }
+        self.min_cells_per_terrain = 5  # Floor per terrain type before proportional allocation
         
         # Confidence thresholds by terrain
         self.confidence_thresholds = {
@@ -75,7 +168,13 @@ class TrainingDataGenerator:
         # Pattern specifications
         self.yearly_window_days = 7  # ±7 days around same date
         self.spatial_neighbors = 8   # 8 surrounding cells
-        self.historical_years = 3    # 3 years of historical data
+        
+        # Neighbor lookup and static cell features (built once from the static grid)
+        self._neighbor_map = None
+        self._cell_features = None
+        
+        # Parallel sample generation (1 = sequential)
+        self.max_workers = mp.cpu_count()
         
         log_progress(f"🎯 Training Data Generator initialized")
         log_progress(f"   Database: {self.db_path}")
@@ -103,13 +202,21 @@ class TrainingDataGenerator:
             test_pool = self._generate_dataset(target_cells, dataset_type="testing")
             log_progress(f"   Generated {len(test_pool)} test samples")
             
-            # Step 4: Save datasets
+            # Step 4: Save datasets - frames are built once and shared with the summary
             log_progress("💾 Saving datasets...")
-            self._save_datasets(training_data, test_pool)
+            training_df = self._build_dataframe(training_data)
+            test_df = self._build_dataframe(test_pool)
+            
+            # Unsorted terrain counts of the training frame, shared by the metadata and the summary
+            if len(training_df) > 0:
+                terrain_counts = training_df['terrain_type'].value_counts(dropna=False, sort=False)
+            else:
+                terrain_counts = pd.Series(dtype=np.int64)
+            self._save_datasets(training_df, test_df, terrain_counts)
             
             # Step 5: Generate summary statistics
             log_progress("📈 Generating summary statistics...")
-            self._generate_summary_stats(training_data, test_pool)
+            self._generate_summary_stats(training_df, test_df, terrain_counts)
             
             processing_time = time.time() - start_time
             log_progress(f"✅ Stage 6 Complete: Training data generated in {processing_time:.1f}s")
@@ -121,75 +228,67 @@ class TrainingDataGenerator:
             logger.error(f"Training data generation failed: {e}", exc_info=True)
             return False
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a read-only database connection tuned for large scans"""
+        # Read-only so Stage 6 never changes the Stage 5 database (journal mode, indexes, -wal files)
+        conn = sqlite3.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True)
+        # Cache size is per connection and every worker opens its own, so keep it modest
+        conn.executescript("""
+            PRAGMA cache_size=-65536;
+            PRAGMA mmap_size=30000000000;
+            PRAGMA temp_store=MEMORY;
+        """)
+        return conn
+    
     def _select_target_cells(self) -> List[Dict]:
         """Select diverse target cells across terrain types with balanced fire/no-fire"""
-        conn = sqlite3.connect(self.db_path)
-        
-        # Get cells with fire data first
-        fire_cells_df = pd.read_sql_query("""
-            SELECT DISTINCT
-                gc.cell_id,
-                gc.center_lat,
-                gc.center_lon,
-                gc.terrain_type,
-                gc.is_water,
-                gc.urban_flag,
-                AVG(wd.confidence_score) as avg_confidence,
-                COUNT(DISTINCT wd.date) as data_days,
-                COUNT(DISTINCT cfr.fire_id) as fire_count
-            FROM grid_cells gc
-            JOIN cell_fire_relationships cfr ON gc.cell_id = cfr.cell_id
-            LEFT JOIN weather_data wd ON gc.cell_id = wd.cell_id
-            WHERE gc.terrain_type IN ('forest', 'land', 'urban', 'water')
-            GROUP BY gc.cell_id, gc.center_lat, gc.center_lon, gc.terrain_type, gc.is_water, gc.urban_flag
-            HAVING data_days >= 100
+        conn = self._connect()
+        
+        # Get weather coverage and fire counts for every candidate cell in one pass
+        cells_df = pd.read_sql_query("""
+            WITH cell_stats AS (
+                SELECT 
+                    gc.cell_id,
+                    gc.center_lat,
+                    gc.center_lon,
+                    gc.terrain_type,
+                    gc.is_water,
+                    gc.urban_flag,
+                    AVG(wd.confidence_score) as avg_confidence,
+                    COUNT(DISTINCT wd.date) as data_days,
+                    COUNT(DISTINCT cfr.fire_id) as fire_count
+                FROM grid_cells gc
+                LEFT JOIN weather_data wd ON gc.cell_id = wd.cell_id
+                LEFT JOIN cell_fire_relationships cfr ON gc.cell_id = cfr.cell_id
+                WHERE gc.terrain_type IN ('forest', 'land', 'urban', 'water')
+                GROUP BY gc.cell_id
+            )
+            SELECT * FROM cell_stats
+            WHERE terrain_type = 'water' OR data_days >= 100
+            ORDER BY cell_id
         """, conn)
         
-        # Get cells without fire data (including water cells with no weather data requirement)
-        # Split into two queries for better performance
-        no_fire_land_cells_df = pd.read_sql_query("""
-            SELECT 
-                gc.cell_id,
-                gc.center_lat,
-                gc.center_lon,
-                gc.terrain_type,
-                gc.is_water,
-                gc.urban_flag,
-                AVG(wd.confidence_score) as avg_confidence,
-                COUNT(DISTINCT wd.date) as data_days,
-                0 as fire_count
-            FROM grid_cells gc
-            LEFT JOIN weather_data wd ON gc.cell_id = wd.cell_id
-            LEFT JOIN cell_fire_relationships cfr ON gc.cell_id = cfr.cell_id
-            WHERE gc.terrain_type IN ('forest', 'land', 'urban')
-            AND cfr.cell_id IS NULL
-            GROUP BY gc.cell_id, gc.center_lat, gc.center_lon, gc.terrain_type, gc.is_water, gc.urban_flag
-            HAVING data_days >= 100
-        """, conn)
+        conn.close()
         
-        # Get water cells separately (no weather data requirement)
-        # Just take the first 50 water cells - they're all the same anyway
-        no_fire_water_cells_df = pd.read_sql_query("""
-            SELECT 
-                gc.cell_id,
-                gc.center_lat,
-                gc.center_lon,
-                gc.terrain_type,
-                gc.is_water,
-                gc.urban_flag,
-                0.0 as avg_confidence,
-                0 as data_days,
-                0 as fire_count
-            FROM grid_cells gc
-            WHERE gc.terrain_type = 'water'
-            LIMIT 50  -- Just take first 50 - they're all identical for training
-        """, conn)
+        # Categorical terrain keeps the per-terrain filters below on integer codes
+        cells_df['terrain_type'] = cells_df['terrain_type'].astype('category')
+        
+        # Cells with fire data
+        fire_cells_df = cells_df[(cells_df['fire_count'] > 0) & (cells_df['data_days'] >= 100)]
+        
+        # Cells without fire data (water cells have no weather data requirement)
+        no_fire_land_cells_df = cells_df[(cells_df['fire_count'] == 0) & (cells_df['data_days'] >= 100) &
+                                         (cells_df['terrain_type'] != 'water')]
+        
+        # Just take the first 50 water cells - they're all identical for training
+        no_fire_water_cells_df = cells_df[cells_df['terrain_type'] == 'water'].head(50).assign(
+            avg_confidence=0.0, data_days=0, fire_count=0
+        )
         
         # Combine the results
+        fire_cells_df = fire_cells_df.reset_index(drop=True)
         no_fire_cells_df = pd.concat([no_fire_land_cells_df, no_fire_water_cells_df], ignore_index=True)
         
-        conn.close()
-        
         log_progress(f"   Found {len(fire_cells_df)} cells with fires")
         log_progress(f"   Found {len(no_fire_cells_df)} cells without fires")
         
@@ -221,8 +320,8 @@ class TrainingDataGenerator:
         log_progress(f"   After filtering - Fire cells: {len(fire_df)}, No-fire cells: {len(no_fire_df)}")
         
         # Stratified sampling with balanced fire/no-fire
-        target_cells = []
-        for terrain_type, proportion in self.terrain_stratification.items():
+        capacities = {}
+        for terrain_type in self.terrain_stratification:
             terrain_fire = fire_df[fire_df['terrain_type'] == terrain_type]
             terrain_no_fire = no_fire_df[no_fire_df['terrain_type'] == terrain_type]
             
@@ -233,17 +332,19 @@ class TrainingDataGenerator:
                     log_progress(f"   ⚠️ No cells found for terrain type: {terrain_type}")
                 continue
             
-            # Calculate samples per terrain type
-            n_samples = int(self.training_targets * proportion)
+            capacities[terrain_type] = len(terrain_fire) + len(terrain_no_fire)
+        
+        allocation = self._allocate_stratified(capacities)
+        
+        target_cells = []
+        for terrain_type, n_samples in allocation.items():
+            terrain_fire = fire_df[fire_df['terrain_type'] == terrain_type]
+            terrain_no_fire = no_fire_df[no_fire_df['terrain_type'] == terrain_type]
             
-            # Ensure at least some fire samples if available
+            # Aim for half fire samples; whichever side runs short is topped up by the other
             n_fire = min(n_samples // 2, len(terrain_fire))
             n_no_fire = min(n_samples - n_fire, len(terrain_no_fire))
-            
-            # If we don't have enough fire samples, take more no-fire samples
-            if n_fire < n_samples // 4:  # At least 25% fire samples
-                n_fire = min(len(terrain_fire), n_samples // 4)
-                n_no_fire = min(n_samples - n_fire, len(terrain_no_fire))
+            n_fire = min(n_samples - n_no_fire, len(terrain_fire))
             
             if n_fire > 0:
                 fire_sample = terrain_fire.sample(n=n_fire, random_state=42)
@@ -266,14 +367,88 @@ class TrainingDataGenerator:
         
         return result_df.to_dict('records')
     
+    def _allocate_stratified(self, capacities: Dict[str, int]) -> Dict[str, int]:
+        """Split training_targets across terrain strata (minimum allocation + largest remainder)"""
+        # Every stratum gets a floor so small terrain types are never dropped
+        floor = min(self.min_cells_per_terrain, self.training_targets // max(1, len(capacities)))
+        allocation = {terrain_type: min(floor, capacity) for terrain_type, capacity in capacities.items()}
+        remaining = self.training_targets - sum(allocation.values())
+        
+        # Distribute the rest by terrain proportion, re-spreading whatever full strata can't take
+        while remaining > 0:
+            open_strata = [t for t in allocation if allocation[t] < capacities[t]]
+            total_weight = sum(self.terrain_stratification[t] for t in open_strata)
+            if total_weight == 0:
+                break
+            
+            quotas = {t: remaining * self.terrain_stratification[t] / total_weight for t in open_strata}
+            shares = {t: math.floor(quota) for t, quota in quotas.items()}
+            
+            # Hand out the truncated seats by largest fractional remainder
+            leftover = remaining - sum(shares.values())
+            by_remainder = sorted(open_strata, key=lambda t: quotas[t] - shares[t], reverse=True)
+            for terrain_type in by_remainder[:leftover]:
+                shares[terrain_type] += 1
+            
+            for terrain_type in open_strata:
+                granted = min(shares[terrain_type], capacities[terrain_type] - allocation[terrain_type])
+                allocation[terrain_type] += granted
+                remaining -= granted
+        
+        return allocation
+    
     def _generate_dataset(self, target_cells: List[Dict], dataset_type: str) -> List[Dict]:
         """Generate training or testing dataset from target cells"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
+        
+        if self._neighbor_map is None:
+            self._neighbor_map = self._build_neighbor_map(conn)
+        if self._cell_features is None:
+            self._cell_features = self._build_cell_features(conn)
         
+        if self.max_workers <= 1 or len(target_cells) <= 1:
+            dataset = self._generate_cell_chunk(target_cells, conn, dataset_type)
+            conn.close()
+            return dataset
+        
+        # Close before forking - each worker opens its own connection
+        conn.close()
+        
+        # Several chunks per worker so slow cells don't leave cores idle
+        chunk_size = max(1, math.ceil(len(target_cells) / (self.max_workers * 4)))
+        cell_chunks = [target_cells[i:i + chunk_size] for i in range(0, len(target_cells), chunk_size)]
+        
+        log_progress(f"   Processing {len(cell_chunks)} cell chunks with {self.max_workers} processes")
+        
+        chunk_samples = {}
+        processed = 0
+        
+        # The generator (neighbor map, cell features) is sent once per worker, not once per chunk
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_cell_chunk_worker, initargs=(self,)) as executor:
+            future_to_chunk = {
+                executor.submit(generate_cell_chunk_parallel, cell_chunk, dataset_type): chunk_id
+                for chunk_id, cell_chunk in enumerate(cell_chunks)
+            }
+            
+            for future in as_completed(future_to_chunk):
+                chunk_id = future_to_chunk[future]
+                chunk_samples[chunk_id] = future.result()
+                processed += len(cell_chunks[chunk_id])
+                log_progress(f"   Processed {processed}/{len(target_cells)} cells")
+        
+        # Reassemble in target cell order so the output doesn't depend on scheduling
+        dataset = []
+        for chunk_id in range(len(cell_chunks)):
+            dataset.extend(chunk_samples[chunk_id])
+        
+        return dataset
+    
+    def _generate_cell_chunk(self, cells: List[Dict], conn: sqlite3.Connection, dataset_type: str) -> List[Dict]:
+        """Generate samples for a list of target cells on one connection"""
         dataset = []
         processed = 0
         
-        for cell in target_cells:
+        for cell in cells:
             try:
                 # Generate samples for this cell
                 cell_samples = self._generate_cell_samples(cell, conn, dataset_type)
@@ -281,13 +456,12 @@ class TrainingDataGenerator:
                 processed += 1
                 
                 if processed % 50 == 0:
-                    log_progress(f"   Processed {processed}/{len(target_cells)} cells ({len(dataset)} samples)")
+                    log_progress(f"   Processed {processed}/{len(cells)} cells ({len(dataset)} samples)")
                     
             except Exception as e:
                 log_progress(f"   ⚠️ Error processing cell {cell['cell_id']}: {e}")
                 continue
         
-        conn.close()
         return dataset
     
     def _generate_cell_samples(self, cell: Dict, conn: sqlite3.Connection, dataset_type: str) -> List[Dict]:
@@ -309,32 +483,37 @@ class TrainingDataGenerator:
             n_samples = min(10 if dataset_type == "training" else 20, len(dates))
             sampled_dates = dates.to_series().sample(n=n_samples, random_state=42)
             
-            samples = []
-            for date in sampled_dates:
-                features = self._generate_features(cell_id, date.strftime('%Y-%m-%d'), conn)
-                if features:
-                    samples.append(features)
-            
-            return samples
+            return [
+                {
+                    'cell_id': cell_id,
+                    'terrain_type': terrain_type,
+                    'is_water': 1,
+                    'urban_flag': cell['urban_flag'],
+                    'target_date': date.strftime('%Y-%m-%d'),
+                    **WATER_FEATURE_TEMPLATE
+                }
+                for date in sampled_dates
+            ]
+        
+        # Preload the cell's weather history once - every sample slices from it
+        cell_weather = self._load_cell_weather(cell_id, conn)
         
         # Get available dates for this cell
-        dates_df = pd.read_sql_query("""
-            SELECT DISTINCT date FROM weather_data 
-            WHERE cell_id = ? 
-            ORDER BY date
-        """, conn, params=(cell_id,))
+        available_days = np.unique(cell_weather['day'])
         
-        if len(dates_df) == 0:
+        if len(available_days) == 0:
             return []
         
         # For training: use 2022-2023 data
         # For testing: use 2024 data
         if dataset_type == "training":
-            date_filter = "date >= '2022-01-01' AND date <= '2023-12-31'"
+            start_date, end_date = '2022-01-01', '2023-12-31'
         else:
-            date_filter = "date >= '2024-01-01' AND date <= '2024-12-31'"
+            start_date, end_date = '2024-01-01', '2024-12-31'
         
-        available_dates = dates_df[dates_df['date'].str.match(r'202[2-4]-\d{2}-\d{2}')]
+        # Integer day numbers make the range check a plain numpy compare
+        in_range = (available_days >= to_day_number(start_date)) & (available_days <= to_day_number(end_date))
+        available_dates = pd.DataFrame({'date': available_days[in_range].astype('datetime64[D]').astype(str)})
         if len(available_dates) == 0:
             return []
         
@@ -387,216 +566,213 @@ class TrainingDataGenerator:
             # For no-fire cells, just sample randomly
             sampled_dates = available_dates.sample(n=n_samples, random_state=42)
         
+        return self._generate_features_fused(cell, sampled_dates['date'].tolist(), cell_weather, conn)
+    
+    def _generate_features_fused(self, cell: Dict, target_dates: List[str],
+                                 cell_weather: Dict[str, np.ndarray], conn: sqlite3.Connection) -> List[Dict]:
+        """Generate complete samples for one land cell from its preloaded weather history"""
+        cell_id = cell['cell_id']
+        
+        # Yearly windows and neighbor weather for every sampled date at once
+        yearly_by_date = self._generate_yearly_patterns(target_dates, cell_weather)
+        spatial_by_date = self._generate_spatial_patterns(cell_id, target_dates, conn)
+        cell_features = self._generate_cell_features(cell_id, conn)
+        
+        # Weather presence and fire status come from the same history - no per-sample queries
+        days = cell_weather['day']
+        target_days = np.array(target_dates, dtype='datetime64[D]').astype(np.int32)
+        idx = np.searchsorted(days, target_days, side='right') - 1
+        has_weather = (idx >= 0) & (days[np.maximum(idx, 0)] == target_days)
+        fire_status = np.where(has_weather, cell_weather['fire_occurred'][np.maximum(idx, 0)], 0)
+        
         samples = []
-        for _, row in sampled_dates.iterrows():
-            target_date = row['date']
-            
-            # Generate features for this target date
-            features = self._generate_features(cell_id, target_date, conn)
-            if features is None:
+        for i, target_date in enumerate(target_dates):
+            if not has_weather[i]:
                 continue
             
-            # Get fire status for this cell-date combination
-            fire_status = self._get_fire_status(cell_id, target_date, conn)
-            
-            sample = {
+            samples.append({
                 'cell_id': cell_id,
                 'target_date': target_date,
-                'terrain_type': terrain_type,
-                'fire_occurred': fire_status,
-                **features
-            }
-            samples.append(sample)
+                'terrain_type': cell['terrain_type'],
+                'fire_occurred': int(fire_status[i]),
+                **yearly_by_date[target_date],
+                **spatial_by_date[target_date],
+                **cell_features
+            })
         
         return samples
     
-    def _generate_features(self, cell_id: int, target_date: str, conn: sqlite3.Connection) -> Optional[Dict]:
-        """Generate features for a target cell-date combination"""
-        try:
-            target_dt = pd.to_datetime(target_date)
-            
-            # Check if this is a water cell - special handling
-            cell_info = pd.read_sql_query("""
-                SELECT terrain_type, is_water, urban_flag FROM grid_cells WHERE cell_id = ?
-            """, conn, params=(cell_id,))
-            
-            if len(cell_info) == 0:
-                return None
-                
-            cell_type = cell_info.iloc[0]['terrain_type']
-            
-            # Special handling for water cells - they have no weather data
-            if cell_type == 'water':
-                return {
-                    'cell_id': cell_id,
-                    'terrain_type': cell_type,
-                    'is_water': 1,
-                    'urban_flag': cell_info.iloc[0]['urban_flag'],
-                    'target_date': target_date,
-                    'year_1_avg_temp': 0.0,
-                    'year_1_max_temp': 0.0,
-                    'year_1_total_precip': 0.0,
-                    'year_1_dry_days': 0.0,
-                    'year_1_fire_occurred': 0.0,
-                    'year_2_avg_temp': 0.0,
-                    'year_2_max_temp': 0.0,
-                    'year_2_total_precip': 0.0,
-                    'year_2_dry_days': 0.0,
-                    'year_2_fire_occurred': 0.0,
-                    'year_3_avg_temp': 0.0,
-                    'year_3_max_temp': 0.0,
-                    'year_3_total_precip': 0.0,
-                    'year_3_dry_days': 0.0,
-                    'year_3_fire_occurred': 0.0,
-                    'neighbor_avg_temp': 0.0,
-                    'neighbor_max_temp': 0.0,
-                    'neighbor_total_precip': 0.0,
-                    'neighbor_fire_frequency': 0.0,
-                    'historical_fire_frequency': 0.0,
-                    'area_km2': 100.0,  # Standard cell area
-                    'elevation_m': 0.0,  # Water level
-                    'distance_to_urban_km': 50.0,  # Assume far from urban
-                    'fire_occurred': 0.0  # Water cells never have fires
-                }
-            
-            # Get target cell weather data
-            target_weather = self._get_cell_weather(cell_id, target_date, conn)
-            if target_weather is None:
-                return None
-            
-            features = {}
-            
-            # 1. Same cell yearly patterns (15 features)
-            yearly_features = self._generate_yearly_patterns(cell_id, target_dt, conn)
-            features.update(yearly_features)
-            
-            # 2. Neighbor spatial patterns (6 features)
-            spatial_features = self._generate_spatial_patterns(cell_id, target_dt, conn)
-            features.update(spatial_features)
-            
-            # 3. Target cell features (4 features)
-            cell_features = self._generate_cell_features(cell_id, conn)
-            features.update(cell_features)
-            
-            return features
-            
-        except Exception as e:
-            log_progress(f"   Error generating features for cell {cell_id}, date {target_date}: {e}")
-            return None
+    def _load_cell_weather(self, cell_id: int, conn: sqlite3.Connection) -> Dict[str, np.ndarray]:
+        """Load a cell's full weather history as numpy columns (dates as int32 day numbers)"""
+        weather_data = pd.read_sql_query("""
+            SELECT wd.date, wd.tmax, wd.tavg, wd.prcp,
+                   CASE WHEN cfr.fire_id IS NOT NULL THEN 1 ELSE 0 END as fire_occurred
+            FROM weather_data wd
+            LEFT JOIN cell_fire_relationships cfr ON wd.cell_id = cfr.cell_id 
+                AND wd.date >= cfr.fire_start_date 
+                AND wd.date <= cfr.fire_end_date
+            WHERE wd.cell_id = ?
+            ORDER BY wd.date
+        """, conn, params=(cell_id,))
+        
+        return {
+            'day': weather_data['date'].to_numpy(dtype='datetime64[D]').astype(np.int32),
+            'tmax': weather_data['tmax'].to_numpy(dtype=float),
+            'tavg': weather_data['tavg'].to_numpy(dtype=float),
+            'prcp': weather_data['prcp'].to_numpy(dtype=float),
+            'fire_occurred': weather_data['fire_occurred'].to_numpy()
+        }
     
-    def _generate_yearly_patterns(self, cell_id: int, target_dt: pd.Timestamp, conn: sqlite3.Connection) -> Dict:
-        """Generate yearly pattern features (15 features)"""
-        features = {}
-        
-        # Get 3 years of historical data
-        for year_offset in range(1, 4):  # 1, 2, 3 years ago
-            historical_year = target_dt.year - year_offset
-            historical_date = target_dt.replace(year=historical_year)
-            
-            # Get ±7 days window around historical date
-            start_date = historical_date - timedelta(days=self.yearly_window_days)
-            end_date = historical_date + timedelta(days=self.yearly_window_days)
-            
-            # Query weather data for this period
-            weather_data = pd.read_sql_query("""
-                SELECT wd.tmax, wd.tmin, wd.tavg, wd.prcp, wd.snwd,
-                       CASE WHEN cfr.fire_id IS NOT NULL THEN 1 ELSE 0 END as fire_occurred
-                FROM weather_data wd
-                LEFT JOIN cell_fire_relationships cfr ON wd.cell_id = cfr.cell_id 
-                    AND wd.date >= cfr.fire_start_date 
-                    AND wd.date <= cfr.fire_end_date
-                WHERE wd.cell_id = ? AND wd.date >= ? AND wd.date <= ?
-            """, conn, params=(cell_id, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
-            
-            if len(weather_data) > 0:
-                # Aggregate weather features
-                features[f'year_{year_offset}_avg_temp'] = weather_data['tavg'].mean()
-                features[f'year_{year_offset}_max_temp'] = weather_data['tmax'].max()
-                features[f'year_{year_offset}_total_precip'] = weather_data['prcp'].sum()
-                features[f'year_{year_offset}_dry_days'] = (weather_data['prcp'] < 1.0).sum()
-                features[f'year_{year_offset}_fire_occurred'] = weather_data['fire_occurred'].max()
-            else:
-                # Fill with defaults if no data
-                features[f'year_{year_offset}_avg_temp'] = 0.0
-                features[f'year_{year_offset}_max_temp'] = 0.0
-                features[f'year_{year_offset}_total_precip'] = 0.0
-                features[f'year_{year_offset}_dry_days'] = 0
-                features[f'year_{year_offset}_fire_occurred'] = 0
-        
-        # Calculate aggregated trends
-        temp_values = [features[f'year_{i}_avg_temp'] for i in range(1, 4)]
-        fire_values = [features[f'year_{i}_fire_occurred'] for i in range(1, 4)]
-        
-        features['avg_temp_trend'] = np.polyfit(range(3), temp_values, 1)[0] if len(temp_values) == 3 else 0.0
-        features['fire_frequency'] = sum(fire_values) / len(fire_values) if fire_values else 0.0
-        features['avg_fire_size'] = 0.0  # Placeholder - would need fire size data
-        
-        return features
+    def _generate_yearly_patterns(self, target_dates: List[str], cell_weather: Dict[str, np.ndarray]) -> Dict[str, Dict]:
+        """Generate yearly pattern features (15 features) for each target date"""
+        days = cell_weather['day']
+        tavg = cell_weather['tavg']
+        tmax = cell_weather['tmax']
+        prcp = cell_weather['prcp']
+        fire_occurred = cell_weather['fire_occurred']
+        
+        # Same calendar day 1, 2 and 3 years back - shape (n_dates, 3), computed as month arithmetic
+        target_dt = np.array(target_dates, dtype='datetime64[D]')
+        target_month = target_dt.astype('datetime64[M]')
+        day_of_month = target_dt - target_month.astype('datetime64[D]')
+        year_offsets = np.arange(1, 4)
+        historical_dt = (target_month[:, None] - 12 * year_offsets[None, :]).astype('datetime64[D]') + day_of_month[:, None]
+        historical_days = historical_dt.astype(np.int64)
+        
+        if NUMBA_AVAILABLE:
+            # Compiled kernel walks each ±7 day window once - no (n_dates, 3, n_days) masks
+            stats = yearly_window_stats(days, tavg, tmax, prcp, fire_occurred,
+                                        historical_days.ravel(), self.yearly_window_days)
+            stats = stats.reshape(historical_days.shape + (5,))
+            avg_temp, max_temp, total_precip, dry_days, fire = (stats[..., k] for k in range(5))
+            fire = fire.astype(int)
+        else:
+            # Boolean mask over the cell's history for every ±7 day window - shape (n_dates, 3, n_days)
+            window = (days >= (historical_days - self.yearly_window_days)[..., None]) & \
+                     (days <= (historical_days + self.yearly_window_days)[..., None])
+            has_data = window.any(axis=2)
+            
+            avg_temp = np.where(has_data, np.nanmean(np.where(window, tavg, np.nan), axis=2), 0.0)
+            max_temp = np.where(has_data, np.nanmax(np.where(window, tmax, np.nan), axis=2), 0.0)
+            total_precip = np.nansum(np.where(window, prcp, 0.0), axis=2)
+            dry_days = np.count_nonzero(window & (prcp < 1.0), axis=2)
+            fire = np.where(window, fire_occurred, 0).max(axis=2, initial=0)
+        
+        # Least-squares slope over x = 0, 1, 2 reduces to (y2 - y0) / 2 - no need for np.polyfit
+        avg_temp_trend = (avg_temp[:, 2] - avg_temp[:, 0]) / 2.0
+        fire_frequency = fire.sum(axis=1) / len(year_offsets)
+        
+        features_by_date = {}
+        for i, target_date in enumerate(target_dates):
+            features = {}
+            for j, year_offset in enumerate(year_offsets):
+                features[f'year_{year_offset}_avg_temp'] = avg_temp[i, j]
+                features[f'year_{year_offset}_max_temp'] = max_temp[i, j]
+                features[f'year_{year_offset}_total_precip'] = total_precip[i, j]
+                features[f'year_{year_offset}_dry_days'] = dry_days[i, j]
+                features[f'year_{year_offset}_fire_occurred'] = fire[i, j]
+            features['avg_temp_trend'] = avg_temp_trend[i]
+            features['fire_frequency'] = fire_frequency[i]
+            features['avg_fire_size'] = 0.0  # Placeholder - would need fire size data
+            features_by_date[target_date] = features
+        
+        return features_by_date
     
-    def _generate_spatial_patterns(self, cell_id: int, target_dt: pd.Timestamp, conn: sqlite3.Connection) -> Dict:
-        """Generate spatial pattern features (6 features)"""
-        features = {}
-        
-        # Get neighbor cells (simplified - would need proper neighbor calculation)
-        # For now, use cells within a small radius
-        neighbor_cells = pd.read_sql_query("""
-            SELECT cell_id FROM grid_cells 
-            WHERE cell_id != ? 
-            ORDER BY ABS(center_lat - (SELECT center_lat FROM grid_cells WHERE cell_id = ?)) + 
-                     ABS(center_lon - (SELECT center_lon FROM grid_cells WHERE cell_id = ?))
-            LIMIT 8
-        """, conn, params=(cell_id, cell_id, cell_id))
-        
-        if len(neighbor_cells) > 0:
-            neighbor_ids = neighbor_cells['cell_id'].tolist()
-            placeholders = ','.join(['?'] * len(neighbor_ids))
-            
-            # Get neighbor weather data for target date
-            neighbor_data = pd.read_sql_query(f"""
-                SELECT wd.tmax, wd.tmin, wd.prcp,
-                       CASE WHEN cfr.fire_id IS NOT NULL THEN 1 ELSE 0 END as fire_occurred
-                FROM weather_data wd
-                LEFT JOIN cell_fire_relationships cfr ON wd.cell_id = cfr.cell_id 
-                    AND wd.date >= cfr.fire_start_date 
-                    AND wd.date <= cfr.fire_end_date
-                WHERE wd.cell_id IN ({placeholders}) AND wd.date = ?
-            """, conn, params=neighbor_ids + [target_dt.strftime('%Y-%m-%d')])
-            
-            if len(neighbor_data) > 0:
-                features['neighbor_avg_temp'] = neighbor_data['tmax'].mean()
-                features['neighbor_max_temp'] = neighbor_data['tmax'].max()
-                features['neighbor_total_precip'] = neighbor_data['prcp'].sum()
-                features['neighbor_dry_days'] = (neighbor_data['prcp'] < 1.0).sum()
-                features['neighbor_fire_frequency'] = neighbor_data['fire_occurred'].mean()
-                features['neighbor_terrain_types'] = 1.0  # Placeholder
+    def _generate_spatial_patterns(self, cell_id: int, target_dates: List[str], conn: sqlite3.Connection) -> Dict[str, Dict]:
+        """Generate spatial pattern features (6 features) for each target date"""
+        default_features = {
+            'neighbor_avg_temp': 0.0,
+            'neighbor_max_temp': 0.0,
+            'neighbor_total_precip': 0.0,
+            'neighbor_dry_days': 0,
+            'neighbor_fire_frequency': 0.0,
+            'neighbor_terrain_types': 0.0
+        }
+        
+        # Get neighbor cells from the precomputed neighbor map
+        neighbor_ids = self._neighbor_map.get(cell_id, [])
+        unique_dates = sorted(set(target_dates))
+        
+        if len(neighbor_ids) == 0 or len(unique_dates) == 0:
+            # No neighbors found
+            return {target_date: dict(default_features) for target_date in target_dates}
+        
+        cell_placeholders = ','.join(['?'] * len(neighbor_ids))
+        date_placeholders = ','.join(['?'] * len(unique_dates))
+        
+        # Get neighbor weather data for all target dates in one query
+        neighbor_data = pd.read_sql_query(f"""
+            SELECT wd.date, wd.tmax, wd.prcp,
+                   CASE WHEN cfr.fire_id IS NOT NULL THEN 1 ELSE 0 END as fire_occurred
+            FROM weather_data wd
+            LEFT JOIN cell_fire_relationships cfr ON wd.cell_id = cfr.cell_id 
+                AND wd.date >= cfr.fire_start_date 
+                AND wd.date <= cfr.fire_end_date
+            WHERE wd.cell_id IN ({cell_placeholders}) AND wd.date IN ({date_placeholders})
+            ORDER BY wd.date
+        """, conn, params=neighbor_ids + unique_dates)
+        
+        # Rows are sorted by date, so each target date is a contiguous slice of plain numpy columns
+        days = neighbor_data['date'].to_numpy(dtype='datetime64[D]').astype(np.int32)
+        tmax = neighbor_data['tmax'].to_numpy(dtype=float)
+        prcp = neighbor_data['prcp'].to_numpy(dtype=float)
+        fire_occurred = neighbor_data['fire_occurred'].to_numpy()
+        
+        features_by_date = {}
+        for target_date in unique_dates:
+            target_day = to_day_number(target_date)
+            lo = np.searchsorted(days, target_day, side='left')
+            hi = np.searchsorted(days, target_day, side='right')
+            if hi > lo:
+                date_prcp = prcp[lo:hi]
+                features_by_date[target_date] = {
+                    'neighbor_avg_temp': np.nanmean(tmax[lo:hi]),
+                    'neighbor_max_temp': np.nanmax(tmax[lo:hi]),
+                    'neighbor_total_precip': np.nansum(date_prcp),
+                    'neighbor_dry_days': np.count_nonzero(date_prcp < 1.0),
+                    'neighbor_fire_frequency': fire_occurred[lo:hi].mean(),
+                    'neighbor_terrain_types': 1.0  # Placeholder
+                }
             else:
                 # Fill with defaults
-                features['neighbor_avg_temp'] = 0.0
-                features['neighbor_max_temp'] = 0.0
-                features['neighbor_total_precip'] = 0.0
-                features['neighbor_dry_days'] = 0
-                features['neighbor_fire_frequency'] = 0.0
-                features['neighbor_terrain_types'] = 0.0
-        else:
-            # No neighbors found
-            features['neighbor_avg_temp'] = 0.0
-            features['neighbor_max_temp'] = 0.0
-            features['neighbor_total_precip'] = 0.0
-            features['neighbor_dry_days'] = 0
-            features['neighbor_fire_frequency'] = 0.0
-            features['neighbor_terrain_types'] = 0.0
-        
-        return features
+                features_by_date[target_date] = dict(default_features)
+        
+        return features_by_date
+    
+    def _build_neighbor_map(self, conn: sqlite3.Connection) -> Dict[int, List[int]]:
+        """Precompute the nearest neighbor cells for every grid cell"""
+        cells_df = pd.read_sql_query("""
+            SELECT cell_id, center_lat, center_lon FROM grid_cells
+        """, conn)
+        
+        if len(cells_df) == 0:
+            return {}
+        
+        cell_ids = cells_df['cell_id'].tolist()
+        coords = cells_df[['center_lat', 'center_lon']].to_numpy()
+        
+        # Manhattan distance (p=1) keeps the ABS(lat) + ABS(lon) neighbor ordering;
+        # query one extra cell because every cell is its own nearest match
+        k = min(self.spatial_neighbors + 1, len(cell_ids))
+        tree = cKDTree(coords)
+        _, indices = tree.query(coords, k=k, p=1)
+        indices = indices.reshape(len(cell_ids), -1)
+        
+        neighbor_map = {}
+        for cell_id, row in zip(cell_ids, indices):
+            neighbors = [cell_ids[i] for i in row if cell_ids[i] != cell_id]
+            neighbor_map[cell_id] = neighbors[:self.spatial_neighbors]
+        
+        log_progress(f"   Built neighbor map for {len(neighbor_map)} grid cells")
+        return neighbor_map
     
     def _generate_cell_features(self, cell_id: int, conn: sqlite3.Connection) -> Dict:
         """Generate target cell features (4 features)"""
-        # Get cell characteristics
-        cell_data = pd.read_sql_query("""
-            SELECT terrain_type, center_lat, center_lon, is_water, urban_flag
-            FROM grid_cells WHERE cell_id = ?
-        """, conn, params=(cell_id,))
+        # Cell features are static - computed once for the whole grid and reused per sample
+        if self._cell_features is None:
+            self._cell_features = self._build_cell_features(conn)
         
-        if len(cell_data) == 0:
+        if cell_id not in self._cell_features:
             return {
                 'terrain_type_encoded': 0,
                 'area_km2': 0.0,
@@ -604,141 +780,179 @@ class TrainingDataGenerator:
                 'elevation': 0.0
             }
         
-        cell = cell_data.iloc[0]
-        
-        # Encode terrain type
-        terrain_encoding = {'forest': 1, 'land': 2, 'urban': 3, 'water': 4}.get(cell['terrain_type'], 0)
-        
-        # Calculate area (simplified - 10km x 10km grid)
-        area_km2 = 100.0  # 10km x 10km = 100 km²
-        
-        # Get historical fire frequency
-        fire_data = pd.read_sql_query("""
-            SELECT COUNT(*) as fire_count
-            FROM cell_fire_relationships 
-            WHERE cell_id = ?
-        """, conn, params=(cell_id,))
-        
-        fire_count = fire_data['fire_count'].iloc[0] if len(fire_data) > 0 else 0
-        historical_fire_frequency = fire_count / 3.0  # 3 years of data
-        
-        # Elevation (placeholder - would need elevation data)
-        elevation = 0.0
-        
-        return {
-            'terrain_type_encoded': terrain_encoding,
-            'area_km2': area_km2,
-            'historical_fire_frequency': historical_fire_frequency,
-            'elevation': elevation
-        }
+        return self._cell_features[cell_id]
     
-    def _get_cell_weather(self, cell_id: int, date: str, conn: sqlite3.Connection) -> Optional[Dict]:
-        """Get weather data for a specific cell-date"""
-        weather_data = pd.read_sql_query("""
-            SELECT tmax, tmin, tavg, prcp, snwd, confidence_score
-            FROM weather_data 
-            WHERE cell_id = ? AND date = ?
-        """, conn, params=(cell_id, date))
+    def _build_cell_features(self, conn: sqlite3.Connection) -> Dict[int, Dict]:
+        """Compute static cell features for every grid cell in one query"""
+        # Get cell characteristics and historical fire count together
+        cell_data = pd.read_sql_query("""
+            SELECT gc.cell_id, gc.terrain_type, COUNT(cfr.cell_id) as fire_count
+            FROM grid_cells gc
+            LEFT JOIN cell_fire_relationships cfr ON gc.cell_id = cfr.cell_id
+            GROUP BY gc.cell_id, gc.terrain_type
+        """, conn)
         
-        if len(weather_data) == 0:
-            return None
+        # Encode terrain type
+        terrain_encoding = {'forest': 1, 'land': 2, 'urban': 3, 'water': 4}
+        
+        cell_features = {}
+        for cell_id, terrain_type, fire_count in cell_data.itertuples(index=False):
+            cell_features[cell_id] = {
+                'terrain_type_encoded': terrain_encoding.get(terrain_type, 0),
+                'area_km2': 100.0,  # 10km x 10km = 100 km²
+                'historical_fire_frequency': fire_count / 3.0,  # 3 years of data
+                'elevation': 0.0  # Placeholder - would need elevation data
+            }
         
-        return weather_data.iloc[0].to_dict()
+        return cell_features
     
-    def _get_fire_status(self, cell_id: int, date: str, conn: sqlite3.Connection) -> int:
-        """Get fire status for a specific cell-date combination"""
-        fire_data = pd.read_sql_query("""
-            SELECT COUNT(*) as fire_count
-            FROM cell_fire_relationships 
-            WHERE cell_id = ? AND ? >= fire_start_date AND ? <= fire_end_date
-        """, conn, params=(cell_id, date, date))
-        
-        return 1 if fire_data['fire_count'].iloc[0] > 0 else 0
+    def _build_dataframe(self, samples: List[Dict]) -> pd.DataFrame:
+        """Build a dataset frame column-wise from sample dicts"""
+        # Column order follows first appearance, same as pd.DataFrame(samples)
+        columns = list(dict.fromkeys(key for sample in samples for key in sample))
+        numeric_columns = [column for column in columns if column not in TEXT_COLUMNS]
+        
+        # Fill one preallocated float matrix instead of letting pandas infer dtypes per cell
+        values = np.full((len(samples), len(numeric_columns)), np.nan)
+        for i, sample in enumerate(samples):
+            values[i] = [sample.get(column, np.nan) for column in numeric_columns]
+        
+        df = pd.DataFrame(values, columns=numeric_columns)
+        if 'cell_id' in df.columns:
+            df['cell_id'] = df['cell_id'].astype(np.int64)
+        for column in TEXT_COLUMNS:
+            if column in columns:
+                df[column] = [sample.get(column) for sample in samples]
+        
+        return df[columns]
     
-    def _save_datasets(self, training_data: List[Dict], test_pool: List[Dict]):
+    def _save_datasets(self, training_df: pd.DataFrame, test_df: pd.DataFrame, terrain_counts: pd.Series):
         """Save training and testing datasets"""
         # Save training data
-        training_df = pd.DataFrame(training_data)
-        training_path = self.output_dir / "training_dataset.csv"
-        training_df.to_csv(training_path, index=False)
+        training_path = self.output_dir / "training_dataset.parquet"
+        training_df.to_parquet(training_path, engine='pyarrow', compression='snappy', index=False)
         log_progress(f"   Saved training dataset: {training_path} ({len(training_df)} samples)")
         
         # Save test pool
-        test_df = pd.DataFrame(test_pool)
-        test_path = self.output_dir / "test_pool.csv"
-        test_df.to_csv(test_path, index=False)
+        test_path = self.output_dir / "test_pool.parquet"
+        test_df.to_parquet(test_path, engine='pyarrow', compression='snappy', index=False)
         log_progress(f"   Saved test pool: {test_path} ({len(test_df)} samples)")
         
+        # Optional CSV copies for manual inspection
+        if self.export_csv:
+            training_df.to_csv(self.output_dir / "training_dataset.csv", index=False)
+            test_df.to_csv(self.output_dir / "test_pool.csv", index=False)
+            log_progress(f"   Saved CSV copies to {self.output_dir}")
+        
         # Save metadata
+        if len(training_df) > 0:
+            features = list(training_df.columns)
+            terrain_distribution = terrain_counts.to_dict()
+            fire_distribution = training_df['fire_occurred'].value_counts().to_dict()
+        else:
+            features, terrain_distribution, fire_distribution = [], {}, {}
+        
         metadata = {
             'generation_date': datetime.now().isoformat(),
-            'training_samples': len(training_data),
-            'test_samples': len(test_pool),
-            'features': list(training_df.columns) if len(training_data) > 0 else [],
-            'terrain_distribution': training_df['terrain_type'].value_counts().to_dict() if len(training_data) > 0 else {},
-            'fire_distribution': training_df['fire_occurred'].value_counts().to_dict() if len(training_data) > 0 else {}
+            'training_samples': len(training_df),
+            'test_samples': len(test_df),
+            'features': features,
+            'terrain_distribution': terrain_distribution,
+            'fire_distribution': fire_distribution
         }
         
         metadata_path = self.output_dir / "dataset_metadata.json"
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        if ORJSON_AVAILABLE:
+            # Numpy scalars and numeric value_counts keys serialize natively
+            options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            metadata_path.write_bytes(orjson.dumps(metadata, option=options))
+        else:
+            with open(metadata_path, 'w') as f:
+                json.dump(metadata, f, indent=2)
         log_progress(f"   Saved metadata: {metadata_path}")
     
-    def _generate_summary_stats(self, training_data: List[Dict], test_pool: List[Dict]):
+    def _generate_summary_stats(self, training_df: pd.DataFrame, test_df: pd.DataFrame, terrain_counts: pd.Series):
         """Generate summary statistics"""
-        if len(training_data) == 0:
+        if len(training_df) == 0:
             log_progress("   ⚠️ No training data to analyze")
             return
         
-        training_df = pd.DataFrame(training_data)
+        # Collect the report in a buffer
+        report = io.StringIO()
+        
+        # Label totals in one pass over the column, reused by every line below
+        fire_values = training_df['fire_occurred'].to_numpy()
+        n_samples = len(fire_values)
+        fire_samples = int(np.nansum(fire_values))
+        fire_rate = fire_samples / n_samples
         
-        log_progress("   📊 Training Dataset Summary:")
-        log_progress(f"      Total samples: {len(training_df)}")
-        log_progress(f"      Fire samples: {training_df['fire_occurred'].sum()}")
-        log_progress(f"      No-fire samples: {len(training_df) - training_df['fire_occurred'].sum()}")
-        log_progress(f"      Fire rate: {training_df['fire_occurred'].mean():.1%}")
+        print("   📊 Training Dataset Summary:", file=report)
+        print(f"      Total samples: {n_samples}", file=report)
+        print(f"      Fire samples: {fire_samples}", file=report)
+        print(f"      No-fire samples: {n_samples - fire_samples}", file=report)
+        print(f"      Fire rate: {fire_rate:.1%}", file=report)
         
         # Data quality validation
-        fire_rate = training_df['fire_occurred'].mean()
         if fire_rate < 0.05:
-            log_progress("      ⚠️ WARNING: Very low fire rate - may need more fire samples")
+            print("      ⚠️ WARNING: Very low fire rate - may need more fire samples", file=report)
         elif fire_rate > 0.5:
-            log_progress("      ⚠️ WARNING: Very high fire rate - may need more no-fire samples")
+            print("      ⚠️ WARNING: Very high fire rate - may need more no-fire samples", file=report)
         else:
-            log_progress("      ✅ Fire rate looks balanced")
+            print("      ✅ Fire rate looks balanced", file=report)
         
-        log_progress("   📊 Terrain Distribution:")
-        terrain_counts = training_df['terrain_type'].value_counts()
+        print("   📊 Terrain Distribution:", file=report)
+        terrain_counts = terrain_counts.sort_values(ascending=False, kind='stable')
         for terrain, count in terrain_counts.items():
-            log_progress(f"      {terrain}: {count} ({count/len(training_df):.1%})")
+            print(f"      {terrain}: {count} ({count/n_samples:.1%})", file=report)
         
-        log_progress("   📊 Feature Quality Check:")
-        numeric_features = training_df.select_dtypes(include=[np.number]).columns
+        print("   📊 Feature Quality Check:", file=report)
+        # _build_dataframe stores every non-text column as a number - no dtype scan needed
+        numeric_features = [column for column in training_df.columns if column not in TEXT_COLUMNS]
+        
+        # Per-feature mean, std and distinct count in one aggregation over the numeric block
+        feature_stats = training_df[numeric_features].agg(['mean', 'std', 'nunique'])
         
         # Check for constant features
-        constant_features = []
-        for feature in numeric_features:
-            if training_df[feature].nunique() <= 1:
-                constant_features.append(feature)
+        nunique_counts = feature_stats.loc['nunique']
+        constant_features = nunique_counts[nunique_counts <= 1].index.tolist()
         
         if constant_features:
-            log_progress(f"      ⚠️ Constant features: {len(constant_features)}")
+            print(f"      ⚠️ Constant features: {len(constant_features)}", file=report)
         else:
-            log_progress("      ✅ No constant features")
+            print("      ✅ No constant features", file=report)
         
-        # Check for missing values
-        missing_data = training_df.isnull().sum()
-        missing_cols = missing_data[missing_data > 0]
+        # Check for missing values - only presence matters, not per-column counts
+        missing_mask = training_df.isna().any()
+        missing_cols = missing_mask[missing_mask].index
         if len(missing_cols) > 0:
-            log_progress(f"      ⚠️ Missing values in {len(missing_cols)} features")
+            print(f"      ⚠️ Missing values in {len(missing_cols)} features", file=report)
         else:
-            log_progress("      ✅ No missing values")
+            print("      ✅ No missing values", file=report)
         
-        log_progress("   📊 Feature Statistics (first 10 features):")
+        print("   📊 Feature Statistics (first 10 features):", file=report)
         for feature in numeric_features[:10]:
-            mean_val = training_df[feature].mean()
-            std_val = training_df[feature].std()
-            log_progress(f"      {feature}: {mean_val:.3f} ± {std_val:.3f}")
+            mean_val = feature_stats.at['mean', feature]
+            std_val = feature_stats.at['std', feature]
+            print(f"      {feature}: {mean_val:.3f} ± {std_val:.3f}", file=report)
+        
+        # Emit the whole report in one write instead of one log call per line
+        log_progress(report.getvalue().rstrip('\n'))
+
+# Generator used by sample generation worker processes (set once per worker by the pool initializer)
+_worker_generator = None
+
+def init_cell_chunk_worker(generator):
+    """Store the generator for this worker process (pool initializer)"""
+    global _worker_generator
+    _worker_generator = generator
+
+def generate_cell_chunk_parallel(cell_chunk, dataset_type):
+    """Generate samples for a chunk of target cells (worker function)"""
+    conn = _worker_generator._connect()
+    try:
+        return _worker_generator._generate_cell_chunk(cell_chunk, conn, dataset_type)
+    finally:
+        conn.close()
 
 def main():
     parser = argparse.ArgumentParser(description='Generate AI training datasets')
@@ -748,6 +962,10 @@ def main():
                        help='Output directory for training data')
     parser.add_argument('--test', action='store_true', help='Run in test mode with smaller datasets')
     parser.add_argument('--test-pool-size', type=int, default=200, help='Size of test pool (default: 200)')
+    parser.add_argument('--csv', action='store_true',
+                       help='Also write CSV copies of the datasets')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for sample generation (default: all CPU cores)')
     
     args = parser.parse_args()
     
@@ -766,6 +984,11 @@ def main():
     # Override test pool size if specified
     generator.test_pool_size = args.test_pool_size
     
+    if args.workers is not None:
+        generator.max_workers = args.workers
+    
+    generator.export_csv = args.csv
+    
     # Generate training data
     success = generator.generate_training_data()
     
@@ -19,7 +19,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent / 'ai'))
 from evolution_framework import EvolutionFramework
 from ai_config import EvolutionConfig
-from seed_ai import SeedAI
+from seed_ai import SeedAI, load_dataset
 
 # Configure logging
 logging.basicConfig(
@@ -31,6 +31,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def find_missing_files(paths):
+    """Return the paths that don't exist"""
+    return [path for path in paths if not Path(path).exists()]
+
 def main():
     """Run AI evolution"""
     parser = argparse.ArgumentParser(description='Stage 7: Evolve AI through competition')
@@ -40,9 +44,9 @@ def main():
                        help='Population size (default: 50)')
     parser.add_argument('--samples', type=int, default=200,
                        help='Test samples per generation (default: 200)')
-    parser.add_argument('--training-data', type=str, default='../../ai/training/training_dataset.csv',
+    parser.add_argument('--training-data', type=str, default='../../ai/training/training_dataset.parquet',
                        help='Path to training data')
-    parser.add_argument('--test-pool', type=str, default='../../ai/training/test_pool.csv',
+    parser.add_argument('--test-pool', type=str, default='../../ai/training/test_pool.parquet',
                        help='Path to test pool')
     parser.add_argument('--output', type=str, default='../../ai/evolved_ai.pkl',
                        help='Output file for best evolved AI')
@@ -68,17 +72,25 @@ def main():
     logger.info(f"📊 Output: {args.output}")
     logger.info("")
     
-    # Check if training data exists
-    if not Path(args.training_data).exists():
+    # Check that both datasets exist
+    missing_files = find_missing_files([args.training_data, args.test_pool])
+    if args.training_data in missing_files:
         logger.error(f"❌ Training data not found: {args.training_data}")
         logger.error("   Run Stage 6 (generate training data) first")
         return False
     
-    if not Path(args.test_pool).exists():
+    if args.test_pool in missing_files:
         logger.error(f"❌ Test pool not found: {args.test_pool}")
         logger.error("   Run Stage 6 (generate training data) first")
         return False
     
+    # Load both datasets once - every AI trains on the same frame instead of re-reading the file
+    logger.info("📂 Loading datasets...")
+    training_data = load_dataset(args.training_data)
+    test_pool = load_dataset(args.test_pool)
+    logger.info(f"   Training samples: {len(training_data)}")
+    logger.info(f"   Test pool samples: {len(test_pool)}")
+    
     # Create output directory
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -96,7 +108,9 @@ def main():
     logger.info("🧬 Initializing evolution framework...")
     evolution = EvolutionFramework(
         evolution_config=evolution_config,
-        training_data_path=args.training_data
+        training_data_path=args.training_data,
+        training_data=training_data,
+        test_pool=test_pool
     )
     
     # Run evolution
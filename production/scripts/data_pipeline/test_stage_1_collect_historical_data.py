@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test Stage 1 Historical Data Collection
+=======================================
+Test tar extraction through pigz.
+"""
+
+import sys
+import gzip
+import importlib
+import io
+import os
+import shutil
+import tarfile
+from pathlib import Path
+
+# Add current directory to path
+sys.path.append(str(Path(__file__).parent))
+
+def import_stage_1(tmp_path, monkeypatch):
+    """Import Stage 1 from a scratch tree - its log file lives at ../../production/logs"""
+    (tmp_path / 'production' / 'logs').mkdir(parents=True, exist_ok=True)
+    work_dir = tmp_path / 'scripts' / 'data_pipeline'
+    work_dir.mkdir(parents=True, exist_ok=True)
+    monkeypatch.chdir(work_dir)
+    return importlib.import_module('stage_1_collect_historical_data')
+
+def install_pigz(tmp_path, monkeypatch):
+    """Make pigz available on PATH, standing in with gzip when it isn't installed"""
+    if shutil.which('pigz'):
+        return
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    pigz = bin_dir / 'pigz'
+    pigz.write_text('#!/bin/sh\nshift\nexec gzip -dc "$@"\n')
+    pigz.chmod(0o755)
+    monkeypatch.setenv('PATH', f"{bin_dir}:{os.environ['PATH']}")
+
+def test_extract_padded_archive_through_pigz(tmp_path, monkeypatch):
+    """Padding after the end-of-archive marker larger than a pipe buffer still extracts cleanly"""
+    stage_1 = import_stage_1(tmp_path, monkeypatch)
+    install_pigz(tmp_path, monkeypatch)
+    assert shutil.which('pigz')
+    
+    collector = stage_1.HistoricalDataCollector(data_dir=str(tmp_path / 'data'))
+    collector.historical_noaa_dir.mkdir(parents=True)
+    
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode='w') as tar:
+        for i in range(3):
+            data = (f"CA00000000{i}" + "2023" * 60 + "\n").encode() * 100
+            member = tarfile.TarInfo(f"ghcnd_all/CA00000000{i}.dly")
+            member.size = len(data)
+            tar.addfile(member, io.BytesIO(data))
+    
+    # Same trailing zero padding as `tar -b 2048` (1 MB records), far beyond the 64 KB pipe buffer
+    padded = archive.getvalue() + bytes(2048 * 512)
+    (collector.historical_noaa_dir / collector.tar_filename).write_bytes(gzip.compress(padded))
+    
+    assert collector.extract_tar_file()
+    extracted = sorted(p.name for p in (collector.historical_noaa_dir / 'ghcnd_all').glob('*.dly'))
+    assert extracted == [f"CA00000000{i}.dly" for i in range(3)]
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test Stage 6 Training Data Generation
+=====================================
+Unit tests for the stratified cell allocation and the yearly window features.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add current directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import stage_6_generate_training_data as stage_6
+from stage_6_generate_training_data import TrainingDataGenerator
+
+LARGE_CAPACITIES = {'forest': 1000, 'land': 1000, 'urban': 1000, 'water': 1000}
+
+def make_generator(tmp_path) -> TrainingDataGenerator:
+    """Generator with default configuration and a throwaway output directory"""
+    return TrainingDataGenerator(db_path=str(tmp_path / 'unused.db'), output_dir=str(tmp_path / 'out'))
+
+def test_allocation_sums_to_target(tmp_path):
+    """Allocations add up to training_targets when capacity allows"""
+    generator = make_generator(tmp_path)
+    allocation = generator._allocate_stratified(LARGE_CAPACITIES)
+    
+    assert sum(allocation.values()) == generator.training_targets
+    assert allocation == {'forest': 197, 'land': 125, 'urban': 101, 'water': 77}
+
+def test_allocation_keeps_minimum_per_terrain(tmp_path):
+    """Every terrain type gets min_cells_per_terrain even with no proportional weight"""
+    generator = make_generator(tmp_path)
+    generator.terrain_stratification = {'forest': 0.7, 'land': 0.3, 'urban': 0.0, 'water': 0.0}
+    allocation = generator._allocate_stratified(LARGE_CAPACITIES)
+    
+    assert sum(allocation.values()) == generator.training_targets
+    assert allocation['urban'] == generator.min_cells_per_terrain
+    assert allocation['water'] == generator.min_cells_per_terrain
+    assert all(count >= generator.min_cells_per_terrain for count in allocation.values())
+
+def test_allocation_never_exceeds_capacity(tmp_path):
+    """Full strata are capped and their share is re-spread over the others"""
+    generator = make_generator(tmp_path)
+    capacities = {'forest': 10, 'land': 1000, 'urban': 3, 'water': 1000}
+    allocation = generator._allocate_stratified(capacities)
+    
+    assert sum(allocation.values()) == generator.training_targets
+    assert allocation['forest'] == 10
+    assert allocation['urban'] == 3
+    assert all(allocation[t] <= capacities[t] for t in capacities)
+
+def test_allocation_ties_break_in_capacity_order(tmp_path):
+    """Equal remainders go to strata in capacity order, the same way every call"""
+    generator = make_generator(tmp_path)
+    generator.training_targets = 22
+    generator.terrain_stratification = {'forest': 0.25, 'land': 0.25, 'urban': 0.25, 'water': 0.25}
+    
+    first = generator._allocate_stratified(LARGE_CAPACITIES)
+    second = generator._allocate_stratified(LARGE_CAPACITIES)
+    
+    assert first == {'forest': 6, 'land': 6, 'urban': 5, 'water': 5}
+    assert second == first
+
+def test_allocation_target_above_total_capacity(tmp_path):
+    """Every stratum is filled to capacity when the target can't be met"""
+    generator = make_generator(tmp_path)
+    capacities = {'forest': 40, 'land': 30, 'urban': 2, 'water': 8}
+    allocation = generator._allocate_stratified(capacities)
+    
+    assert allocation == capacities
+
+def make_cell_weather(seed: int = 0) -> dict:
+    """Four years of daily history with gaps, missing values and fire days"""
+    rng = np.random.default_rng(seed)
+    all_days = np.arange(np.datetime64('2020-01-01'), np.datetime64('2024-12-31')).astype(np.int32)
+    days = np.sort(rng.choice(all_days, size=len(all_days) * 2 // 3, replace=False))
+    tavg = rng.normal(5.0, 12.0, len(days))
+    tmax = tavg + rng.uniform(0.0, 10.0, len(days))
+    prcp = rng.exponential(2.0, len(days))
+    for column in (tavg, tmax, prcp):
+        column[rng.random(len(days)) < 0.1] = np.nan
+    return {
+        'day': days,
+        'tmax': tmax,
+        'tavg': tavg,
+        'prcp': prcp,
+        'fire_occurred': (rng.random(len(days)) < 0.05).astype(np.int64)
+    }
+
+@pytest.mark.skipif(not stage_6.NUMBA_AVAILABLE, reason="numba not installed")
+def test_yearly_patterns_numba_matches_numpy(tmp_path, monkeypatch):
+    """Compiled kernel and numpy fallback agree within YEARLY_WINDOW_RTOL"""
+    generator = make_generator(tmp_path)
+    cell_weather = make_cell_weather()
+    target_dates = [str(day) for day in np.arange(np.datetime64('2023-01-01'), np.datetime64('2025-01-01'), 9)]
+    
+    compiled = generator._generate_yearly_patterns(target_dates, cell_weather)
+    monkeypatch.setattr(stage_6, 'NUMBA_AVAILABLE', False)
+    fallback = generator._generate_yearly_patterns(target_dates, cell_weather)
+    
+    assert compiled.keys() == fallback.keys()
+    for target_date in target_dates:
+        assert compiled[target_date].keys() == fallback[target_date].keys()
+        features = list(compiled[target_date])
+        np.testing.assert_allclose(
+            [compiled[target_date][name] for name in features],
+            [fallback[target_date][name] for name in features],
+            rtol=stage_6.YEARLY_WINDOW_RTOL, atol=0, equal_nan=True
+        )